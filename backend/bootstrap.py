@@ -162,6 +162,10 @@ def _reexec_in_venv(logger: Optional[BootstrapLogger] = None, venv_dir: str = ".
 		if venv_python:
 			if logger:
 				logger.info(f"Reejecutando en venv: {venv_python}")
+			# execv reemplaza el proceso actual (mismo PID, sin proceso lanzador
+			# esperando); el buffer de stdio no sobrevive, así que se vacía antes
+			sys.stdout.flush()
+			sys.stderr.flush()
 			os.execv(venv_python, [venv_python, *sys.argv])
 	
 	if logger:
@@ -11,6 +11,14 @@ import asyncio
 _console = None
 _command_loop: Optional[asyncio.AbstractEventLoop] = None
 
+# Formato de cada tipo de mensaje en CommandContext.render()
+_RENDER_FORMATS = {
+	"error": "[error][ERROR][/error] {}",
+	"warning": "[warning][WARNING][/warning] {}",
+	"success": "[success][SUCCESS][/success] {}",
+	"info": "[info]{}[/info]",
+}
+
 def _get_console():
 	"""Obtiene la consola, inicializándola si es necesario."""
 	global _console
@@ -50,16 +58,24 @@ class CommandContext:
 	
 	def render(self) -> None:
 		"""Renderiza todos los mensajes con colores usando la consola global."""
-		console_instance = _get_console()
+		if not self.output:
+			return
+		from rich.console import Group
+		from rich.errors import MarkupError
+		from rich.markup import escape
+		from rich.text import Text
+
+		# Un solo print para todo el bloque (ej: help tiene ~60 líneas), pero cada
+		# línea se parsea por separado: una etiqueta sin cerrar no tiñe las siguientes
+		lines = []
 		for msg_type, message in self.output:
-			if msg_type == "error":
-				console_instance.print(f"[error][ERROR][/error] {message}")
-			elif msg_type == "warning":
-				console_instance.print(f"[warning][WARNING][/warning] {message}")
-			elif msg_type == "success":
-				console_instance.print(f"[success][SUCCESS][/success] {message}")
-			else:
-				console_instance.print(f"[info]{message}[/info]")
+			fmt = _RENDER_FORMATS.get(msg_type, _RENDER_FORMATS["info"])
+			try:
+				lines.append(Text.from_markup(fmt.format(message)))
+			except MarkupError:
+				# Markup inválido en el mensaje (p. ej. un "[/x]" suelto): se muestra literal
+				lines.append(Text.from_markup(fmt.format(escape(message))))
+		_get_console().print(Group(*lines))
 
 
 
@@ -19,7 +19,7 @@ def _normalize_avatar_url(raw_url: str | None) -> str:
 		return DEFAULT_AVATAR
 
 	lower = value.lower()
-	if lower.startswith("http://") or lower.startswith("https://"):
+	if lower.startswith(("http://", "https://")):
 		return value
 
 	clean = value.lstrip("/").replace("\\", "/")
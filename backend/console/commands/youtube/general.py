@@ -112,10 +112,22 @@ class CommandContext:
         self.output.append(("success", message))
     
     def render(self) -> None:
-        """Renderiza todos los mensajes."""
-        console = _get_console()
+        """Renderiza todos los mensajes (en un solo print)."""
+        if not self.output:
+            return
+        from rich.console import Group
+        from rich.errors import MarkupError
+        from rich.markup import escape
+        from rich.text import Text
+
+        # Cada línea se parsea por separado: una etiqueta sin cerrar no tiñe las siguientes
+        lines = []
         for msg_type, message in self.output:
-            console.print(f"[{msg_type}]{message}[/{msg_type}]")
+            try:
+                lines.append(Text.from_markup(f"[{msg_type}]{message}[/{msg_type}]"))
+            except MarkupError:
+                lines.append(Text.from_markup(f"[{msg_type}]{escape(message)}[/{msg_type}]"))
+        _get_console().print(Group(*lines))
 
 
 # ============================================================================
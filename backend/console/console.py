@@ -219,7 +219,7 @@ async def start_console() -> None:
 		
 		# Ejecutar el loop de la consola en un thread separado
 		# Esto evita bloquear el event loop de asyncio
-		loop = asyncio.get_event_loop()
+		loop = asyncio.get_running_loop()
 		set_command_event_loop(loop)
 		
 		try:
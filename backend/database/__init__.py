@@ -3,5 +3,6 @@ Modelos y definición de tablas para PowerBot SQLite.
 Importa automáticamente las tablas al iniciar.
 """
 from .connection import get_connection, init_database, DB_PATH
+from .executor import DB_EXECUTOR
 
-__all__ = ['get_connection', 'init_database', 'DB_PATH']
+__all__ = ['get_connection', 'init_database', 'DB_PATH', 'DB_EXECUTOR']
@@ -8,6 +8,9 @@ from pathlib import Path
 # Ruta de la base de datos
 DB_PATH = Path(__file__).parent.parent / "data" / "powerbot.db"
 
+# El directorio data solo se crea una vez por proceso
+_data_dir_ready = False
+
 
 def get_connection() -> sqlite3.Connection:
     """
@@ -16,8 +19,12 @@ def get_connection() -> sqlite3.Connection:
     Returns:
         sqlite3.Connection: Conexión a la base de datos
     """
-    # Asegurar que el directorio data existe
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    global _data_dir_ready
+    
+    # Asegurar que el directorio data existe (una sola vez por proceso)
+    if not _data_dir_ready:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _data_dir_ready = True
     
     # Crear conexión con row_factory para acceso por nombre
     conn = sqlite3.connect(str(DB_PATH))
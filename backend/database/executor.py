@@ -0,0 +1,12 @@
+"""
+Executor dedicado para las consultas SQLite lanzadas desde código async.
+
+Mantiene un pool de hilos persistente y separado del executor por defecto
+del loop, que comparten descargas, tareas de Discord, etc.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+# SQLite serializa las escrituras: más hilos solo añadirían espera por el lock
+DB_MAX_WORKERS = 8
+
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=DB_MAX_WORKERS, thread_name_prefix="db")
@@ -28,10 +28,12 @@ from .user_lookup_manager import (
     find_user_by_discord_id,
     find_user_by_youtube_channel_id,
     find_user_by_global_id,
+    find_users_by_global_ids,
     find_user,
     find_user_smart,
     user_exists,
     get_user_platform_ids,
+    get_user_full_profile,
 )
 
 __all__ = [
@@ -61,8 +63,10 @@ __all__ = [
     'find_user_by_discord_id',
     'find_user_by_youtube_channel_id',
     'find_user_by_global_id',
+    'find_users_by_global_ids',
     'find_user',
     'find_user_smart',
     'user_exists',
     'get_user_platform_ids',
+    'get_user_full_profile',
 ]
@@ -9,13 +9,24 @@ Responsabilidades:
 - Detectar cambios de avatares
 - Limpiar avatares no usados
 """
+import asyncio
+import atexit
 import logging
 import hashlib
-import requests
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Optional, Literal, Dict, Tuple, Any, List
 from datetime import datetime
 
+# requests y Pillow se importan al primer uso: importar este módulo (p. ej. solo
+# para get_avatar_local_path) no paga el arranque de la pila HTTP ni de PIL
+
 logger = logging.getLogger(__name__)
 
 # Directorios de almacenamiento por plataforma
@@ -23,6 +34,358 @@ AVATARS_BASE = Path(__file__).parent.parent.parent / "media"
 AVATARS_YOUTUBE = AVATARS_BASE / "yt_avatars"
 AVATARS_DISCORD = AVATARS_BASE / "dc_avatars"
 
+# Mismos directorios como str, para os.path/os.scandir sin construir Path por llamada
+AVATARS_YOUTUBE_STR = os.fspath(AVATARS_YOUTUBE)
+AVATARS_DISCORD_STR = os.fspath(AVATARS_DISCORD)
+
+# Plataforma -> (directorio local, ruta relativa que se guarda/expone, directorio como str)
+_PLATFORM_DIRS: Dict[str, Tuple[Path, str, str]] = {
+    "youtube": (AVATARS_YOUTUBE, "media/yt_avatars", AVATARS_YOUTUBE_STR),
+    "discord": (AVATARS_DISCORD, "media/dc_avatars", AVATARS_DISCORD_STR),
+}
+
+# Entradas máximas de cada índice en memoria (_cached_urls, _files_by_url_hash);
+# al pasarse se descartan las menos recientes
+AVATAR_INDEX_MAX_ENTRIES = 4096
+
+# URLs ya cacheadas en disco durante este proceso: (platform, user_id) -> URL remota.
+# Permite que la precarga del listener y las llamadas repetidas no vuelvan a descargar.
+_cached_urls: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+# Índice por contenido: sha256(URL remota) -> ruta (str) del archivo local ya descargado.
+# Si otro usuario/plataforma usa la misma URL se copia el archivo sin ir a la red.
+# _url_hash_by_file es el inverso: al reescribir o borrar un archivo se olvida el
+# hash que apuntaba a él (si no, otro usuario copiaría el avatar nuevo con la URL vieja)
+_files_by_url_hash: "OrderedDict[str, str]" = OrderedDict()
+_url_hash_by_file: Dict[str, str] = {}
+_index_lock = threading.Lock()
+
+# Validadores HTTP persistidos entre reinicios: sha256(platform|user_id|URL) ->
+# {"file", "etag", "last_modified"}. Permite un GET condicional (304) en lugar
+# de volver a bajar y escribir un avatar que no cambió. Se carga al primer uso.
+# Los cambios se escriben a disco agrupados, como mucho cada AVATAR_CACHE_FLUSH_SECONDS
+# (y al salir): serializar el JSON entero por descarga frenaba a download_many.
+AVATAR_CACHE_FILE = AVATARS_BASE / "avatar_cache.json"
+AVATAR_CACHE_FLUSH_SECONDS = 5.0
+_validators: Optional[Dict[str, Dict[str, Any]]] = None
+_validators_lock = threading.Lock()
+_validators_dirty = False
+_flush_timer: Optional[threading.Timer] = None
+_flush_lock = threading.Lock()
+
+# Plataformas cuyo directorio ya se creó en este proceso (initialize es idempotente)
+_initialized_platforms: set = set()
+
+# Sesión HTTP compartida: reutiliza conexiones keep-alive/TLS con los CDNs
+# (yt3.ggpht.com, cdn.discordapp.com) en lugar de abrir una por descarga.
+# Se crea en la primera descarga (ver _get_session)
+_SESSION = None
+_session_lock = threading.Lock()
+
+# Tamaño del pool de conexiones: hosts distintos (CDNs) y conexiones por host
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 64
+
+# (conexión, lectura) en segundos: un CDN que no responde falla rápido
+HTTP_TIMEOUT = (3, 10)
+
+# Módulo PIL.Image, False si Pillow no está instalado, None si aún no se probó
+_pil_image = None
+
+# Copia local canónica: lado máximo (px) y calidad WebP (requiere Pillow)
+AVATAR_STORE_SIZE = 128
+AVATAR_WEBP_QUALITY = 80
+
+# Cuerpos declarados hasta este tamaño se leen enteros y se escriben con os.write
+# (avatares típicos de 3-20 KiB); los mayores o sin Content-Length van por streaming
+SMALL_AVATAR_BYTES = 64 * 1024
+
+# Un avatar descargado hace menos de esto se da por vigente sin consultar al CDN
+AVATAR_FRESH_SECONDS = 24 * 3600
+
+# Sufijos de los temporales de _tmp_path_for; cleanup_unused_avatars solo borra
+# los más antiguos que esto (restos de un proceso cortado, no descargas en curso)
+_TMP_SUFFIXES = (".part", ".transcode")
+TMP_FILE_MAX_AGE_SECONDS = 3600
+
+# Descargas simultáneas máximas en download_many (por debajo del pool de la sesión)
+DOWNLOAD_CONCURRENCY = 32
+
+# Tamaño (px) que se pide al CDN de YouTube para la copia local
+YOUTUBE_AVATAR_SIZE = 128
+_YT_SIZE_PARAM = re.compile(r"=s\d+")
+
+
+def _validators_key(platform: str, user_id: str, avatar_url: str) -> str:
+    return hashlib.sha256(f"{platform}|{user_id}|{avatar_url}".encode("utf-8")).hexdigest()
+
+
+def _load_validators() -> Dict[str, Dict[str, Any]]:
+    """Carga (una vez) el cache de validadores desde disco. Llamar con el lock tomado."""
+    global _validators
+    if _validators is None:
+        try:
+            with open(AVATAR_CACHE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _validators = data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            _validators = {}
+    return _validators
+
+
+def _get_validator(key: str) -> Optional[Dict[str, Any]]:
+    with _validators_lock:
+        return _load_validators().get(key)
+
+
+def _schedule_validators_flush() -> None:
+    """Marca el JSON como pendiente y programa su escritura. Llamar con el lock tomado."""
+    global _validators_dirty, _flush_timer
+    _validators_dirty = True
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(AVATAR_CACHE_FLUSH_SECONDS, flush_validators)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def _store_validator(key: str, entry: Optional[Dict[str, Any]]) -> None:
+    """Guarda (o borra con entry=None) un validador; el JSON se escribe en diferido."""
+    with _validators_lock:
+        validators = _load_validators()
+        if entry is None:
+            if validators.pop(key, None) is None:
+                return
+        else:
+            validators[key] = entry
+        _schedule_validators_flush()
+
+
+def _drop_validators_for_files(platform: str, filenames: set) -> None:
+    """Borra los validadores de archivos ya eliminados (cleanup_unused_avatars)."""
+    if not filenames:
+        return
+    with _validators_lock:
+        validators = _load_validators()
+        stale_keys = [
+            key for key, entry in validators.items()
+            if entry.get("file") in filenames and entry.get("platform", platform) == platform
+        ]
+        for key in stale_keys:
+            del validators[key]
+        if stale_keys:
+            _schedule_validators_flush()
+
+
+def flush_validators() -> None:
+    """Escribe ya en disco los validadores pendientes (temporizador y salida del proceso)."""
+    global _validators_dirty, _flush_timer
+    with _flush_lock:
+        # La copia se hace con el lock; la serialización y la escritura, sin él
+        with _validators_lock:
+            _flush_timer = None
+            if not _validators_dirty or _validators is None:
+                return
+            snapshot = dict(_validators)
+            _validators_dirty = False
+        try:
+            AVATARS_BASE.mkdir(parents=True, exist_ok=True)
+            tmp_path = AVATAR_CACHE_FILE.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp_path, AVATAR_CACHE_FILE)
+        except OSError as e:
+            logger.debug("Could not persist avatar cache: %s", e)
+            # Se reintenta en la próxima escritura programada
+            with _validators_lock:
+                _validators_dirty = True
+
+
+atexit.register(flush_validators)
+
+
+def _get_session():
+    """Devuelve la sesión HTTP compartida, creándola (e importando requests) la primera vez."""
+    global _SESSION
+    if _SESSION is None:
+        with _session_lock:
+            if _SESSION is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                # Reintentos con backoff solo ante fallos de conexión y 429/5xx;
+                # pool_maxsize cubre download_many + el executor del packager de YouTube
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset({"GET"}),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def _request_exception():
+    """requests.RequestException; solo se evalúa al capturar un error, con requests ya cargado."""
+    import requests
+    return requests.RequestException
+
+
+def _get_pil_image():
+    """Importa PIL.Image una sola vez; None si Pillow no está disponible."""
+    global _pil_image
+    if _pil_image is None:
+        try:
+            from PIL import Image
+            _pil_image = Image
+        except ImportError:  # Pillow es opcional: sin él se guarda el archivo original
+            _pil_image = False
+        else:
+            _log_pil_jpeg_backend()
+    return _pil_image or None
+
+
+def _log_pil_jpeg_backend() -> None:
+    """Informa (una vez) si Pillow decodifica JPEG con libjpeg-turbo (SIMD) o con libjpeg."""
+    try:
+        import PIL
+        from PIL import features
+        turbo = features.check_feature("libjpeg_turbo")
+    except Exception:
+        return
+    if turbo:
+        logger.debug("Pillow %s con libjpeg-turbo para avatares", PIL.__version__)
+    else:
+        logger.info(
+            "Pillow %s sin libjpeg-turbo: la conversión de avatares JPEG será más lenta "
+            "(instala un Pillow enlazado a libjpeg-turbo, p. ej. las wheels oficiales)",
+            PIL.__version__,
+        )
+
+
+def _remember_cached_url(platform: str, user_id: str, avatar_url: str) -> None:
+    with _index_lock:
+        _cached_urls[(platform, user_id)] = avatar_url
+        _cached_urls.move_to_end((platform, user_id))
+        while len(_cached_urls) > AVATAR_INDEX_MAX_ENTRIES:
+            _cached_urls.popitem(last=False)
+
+
+def _forget_cached_url(platform: str, user_id: str) -> None:
+    with _index_lock:
+        _cached_urls.pop((platform, user_id), None)
+
+
+def _remember_file_hash(url_hash: str, path: str) -> None:
+    """Registra que path contiene el avatar de la URL con hash url_hash."""
+    with _index_lock:
+        old_hash = _url_hash_by_file.pop(path, None)
+        if old_hash is not None:
+            _files_by_url_hash.pop(old_hash, None)
+        old_path = _files_by_url_hash.pop(url_hash, None)
+        if old_path is not None:
+            _url_hash_by_file.pop(old_path, None)
+        _files_by_url_hash[url_hash] = path
+        _url_hash_by_file[path] = url_hash
+        while len(_files_by_url_hash) > AVATAR_INDEX_MAX_ENTRIES:
+            _, evicted_path = _files_by_url_hash.popitem(last=False)
+            _url_hash_by_file.pop(evicted_path, None)
+
+
+def _forget_file(path: str) -> None:
+    """Quita del índice por contenido el hash que apunta a path (antes de reescribirlo o borrarlo)."""
+    with _index_lock:
+        url_hash = _url_hash_by_file.pop(path, None)
+        if url_hash is not None:
+            _files_by_url_hash.pop(url_hash, None)
+
+
+def _file_for_url_hash(url_hash: str) -> Optional[str]:
+    with _index_lock:
+        return _files_by_url_hash.get(url_hash)
+
+
+def _tmp_path_for(path: str, suffix: str = "part") -> str:
+    """
+    Ruta temporal única por hilo para escribir path antes del os.replace.
+
+    Dos descargas del mismo usuario pueden solaparse (p. ej. precargas de dos
+    páginas seguidas); con un .part compartido ambas escribirían sobre el mismo archivo.
+    """
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.{suffix}"
+
+
+def _unlink_quiet(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _copy_limited(src, dst, limit: int, chunk_size: int = 65536) -> int:
+    """Copia src -> dst por bloques hasta limit bytes; devuelve los bytes copiados."""
+    copied = 0
+    while copied < limit:
+        chunk = src.read(min(chunk_size, limit - copied))
+        if not chunk:
+            break
+        dst.write(chunk)
+        copied += len(chunk)
+    return copied
+
+
+def _write_small_file(path: str, data: bytes) -> None:
+    """Escribe data con os.write sobre el descriptor, sin capa de buffer de Python."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _transcode_to_webp(src: str, dst: str) -> bool:
+    """
+    Reduce el avatar a AVATAR_STORE_SIZE y lo guarda como WebP en dst.
+
+    Returns:
+        True si se generó dst; False si Pillow no está o la imagen no se pudo
+        convertir (se conserva el archivo original)
+    """
+    Image = _get_pil_image()
+    if Image is None:
+        return False
+    try:
+        with Image.open(src) as img:
+            # GIF animados: se dejan tal cual para no perder la animación
+            if getattr(img, "is_animated", False):
+                return False
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+            img.thumbnail((AVATAR_STORE_SIZE, AVATAR_STORE_SIZE), Image.LANCZOS)
+            img.save(dst, "WEBP", quality=AVATAR_WEBP_QUALITY, method=4)
+        return True
+    except Exception as e:
+        logger.debug("WebP transcode skipped for %s: %s", os.path.basename(src), e)
+        _unlink_quiet(dst)
+        return False
+
+
+def _remove_sibling_avatars(avatars_dir: str, user_id: str, keep_suffix: str) -> None:
+    """Borra copias del mismo usuario con otra extensión (get_avatar_local_path las vería primero)."""
+    for ext in AvatarManager.ALLOWED_EXTENSIONS:
+        if ext != keep_suffix:
+            sibling = f"{avatars_dir}{os.sep}{user_id}{ext}"
+            _forget_file(sibling)
+            _unlink_quiet(sibling)
+
 
 class AvatarManager:
     """Gestor centralizado de avatares para múltiples plataformas."""
@@ -45,12 +408,14 @@ class AvatarManager:
             bool: True si fue exitoso
         """
         try:
-            if platform is None or platform == "youtube":
+            if (platform is None or platform == "youtube") and "youtube" not in _initialized_platforms:
                 AVATARS_YOUTUBE.mkdir(parents=True, exist_ok=True)
+                _initialized_platforms.add("youtube")
                 logger.info(f"✅ YouTube avatar directory initialized: {AVATARS_YOUTUBE}")
             
-            if platform is None or platform == "discord":
+            if (platform is None or platform == "discord") and "discord" not in _initialized_platforms:
                 AVATARS_DISCORD.mkdir(parents=True, exist_ok=True)
+                _initialized_platforms.add("discord")
                 logger.info(f"✅ Discord avatar directory initialized: {AVATARS_DISCORD}")
             
             return True
@@ -58,6 +423,29 @@ class AvatarManager:
             logger.error(f"❌ Error initializing avatar directories: {e}")
             return False
     
+    @staticmethod
+    def _sized_youtube_url(avatar_url: str, size: int = YOUTUBE_AVATAR_SIZE) -> str:
+        """
+        Pide al CDN de YouTube (ggpht/googleusercontent) el avatar ya reducido.
+        
+        Args:
+            avatar_url: URL remota del avatar
+            size: Lado en píxeles
+            
+        Returns:
+            str: URL con el parámetro de tamaño ajustado (o la original si no aplica)
+        """
+        if "ggpht.com" not in avatar_url and "googleusercontent.com" not in avatar_url:
+            return avatar_url
+        
+        if _YT_SIZE_PARAM.search(avatar_url):
+            return _YT_SIZE_PARAM.sub(f"=s{size}", avatar_url, count=1)
+        
+        if "=" not in avatar_url.rsplit("/", 1)[-1]:
+            return f"{avatar_url}=s{size}-c"
+        
+        return avatar_url
+    
     @staticmethod
     def download_avatar(
         user_id: str,
@@ -80,57 +468,192 @@ class AvatarManager:
             str: URL remoto del avatar (para BD), o None si falló
         """
         if not avatar_url_remote:
-            logger.debug(f"No avatar URL provided for {user_id} ({platform})")
+            logger.debug("No avatar URL provided for %s (%s)", user_id, platform)
             return None
         
+        # Ya descargado en este proceso con la misma URL: no repetir la petición
+        if _cached_urls.get((platform, user_id)) == avatar_url_remote:
+            return avatar_url_remote
+        
         # Seleccionar directorio según plataforma
-        if platform == "youtube":
-            avatars_dir = AVATARS_YOUTUBE
-            media_path = "media/yt_avatars"
-        elif platform == "discord":
-            avatars_dir = AVATARS_DISCORD
-            media_path = "media/dc_avatars"
-        else:
+        platform_dirs = _PLATFORM_DIRS.get(platform)
+        if platform_dirs is None:
             logger.error(f"Unknown platform: {platform}")
             return None
+        # Rutas como str (f-strings) en todo el camino caliente: sin objetos Path por llamada
+        avatars_dir = platform_dirs[2]
+        
+        url_hash = hashlib.sha256(avatar_url_remote.encode("utf-8")).hexdigest()
+        existing_file = _file_for_url_hash(url_hash)
+        if existing_file is not None:
+            try:
+                if not os.path.isfile(existing_file):
+                    raise FileNotFoundError(existing_file)
+                AvatarManager.initialize(platform)
+                suffix = os.path.splitext(existing_file)[1]
+                filepath = f"{avatars_dir}{os.sep}{user_id}{suffix}"
+                reused = True
+                if filepath != existing_file:
+                    # Copia a .part + os.replace: igual de atómico que una descarga
+                    tmp_path = _tmp_path_for(filepath)
+                    try:
+                        shutil.copyfile(existing_file, tmp_path)
+                        # Si mientras tanto se reescribió el origen (su dueño cambió de
+                        # avatar), su hash ya no está en el índice: la copia no sirve
+                        reused = _file_for_url_hash(url_hash) == existing_file
+                        if reused:
+                            _forget_file(filepath)
+                            os.replace(tmp_path, filepath)
+                        else:
+                            _unlink_quiet(tmp_path)
+                    except BaseException:
+                        _unlink_quiet(tmp_path)
+                        raise
+                    if reused:
+                        _remove_sibling_avatars(avatars_dir, user_id, suffix)
+                if reused:
+                    _remember_cached_url(platform, user_id, avatar_url_remote)
+                    logger.debug("Avatar reused from %s for %s (%s)", os.path.basename(existing_file), user_id, platform)
+                    return avatar_url_remote
+            except OSError:
+                # El archivo original ya no existe (o se borró el directorio): descargar de nuevo
+                _forget_file(existing_file)
+                _initialized_platforms.discard(platform)
+        
+        # Avatar ya descargado antes para esta misma URL (también en otro arranque)
+        validator_key = _validators_key(platform, user_id, avatar_url_remote)
+        validator = _get_validator(validator_key)
+        request_headers = {}
+        local_file = None
+        if validator:
+            local_file = f"{avatars_dir}{os.sep}{validator.get('file', '')}"
+            try:
+                local_mtime = os.stat(local_file).st_mtime
+            except OSError:
+                local_file = None
+        
+        if local_file is not None:
+            # Reciente: un solo stat, sin petición HTTP
+            if time.time() - local_mtime < AVATAR_FRESH_SECONDS:
+                _remember_cached_url(platform, user_id, avatar_url_remote)
+                _remember_file_hash(url_hash, local_file)
+                return avatar_url_remote
+            
+            # Más antiguo: GET condicional con ETag/Last-Modified
+            if validator.get("etag"):
+                request_headers["If-None-Match"] = validator["etag"]
+            if validator.get("last_modified"):
+                request_headers["If-Modified-Since"] = validator["last_modified"]
+        
+        session = _get_session()
         
         try:
             # Descargar imagen para validaciones locales
-            response = requests.get(avatar_url_remote, timeout=10)
-            response.raise_for_status()
+            # En YouTube el CDN redimensiona gratis: bajar 128px en vez de s800
+            fetch_url = avatar_url_remote
+            if platform == "youtube":
+                fetch_url = AvatarManager._sized_youtube_url(avatar_url_remote)
+            max_bytes = int(AvatarManager.MAX_SIZE_MB * 1024 * 1024)
             
-            # Validar tamaño
-            content_length = len(response.content)
-            if content_length > AvatarManager.MAX_SIZE_MB * 1024 * 1024:
+            # stream=True: el cuerpo se copia a disco por bloques en vez de cargarse entero en RAM
+            with session.get(fetch_url, timeout=HTTP_TIMEOUT, stream=True, headers=request_headers) as response:
+                if response.status_code == 304 and request_headers:
+                    # Sin cambios en el servidor: el archivo local sigue siendo válido
+                    # (se renueva su mtime para que vuelva a contar como reciente)
+                    os.utime(local_file)
+                    _remember_cached_url(platform, user_id, avatar_url_remote)
+                    _remember_file_hash(url_hash, local_file)
+                    logger.debug("Avatar not modified (%s): %s", platform, validator["file"])
+                    return avatar_url_remote
+                
+                response.raise_for_status()
+                
+                # response.raw entrega el cuerpo tal cual llega: sin esto una respuesta
+                # gzip/deflate se guardaría comprimida (imagen corrupta)
+                response.raw.decode_content = True
+                
+                # Validar tamaño declarado antes de descargar el cuerpo
+                declared_length = int(response.headers.get('content-length') or 0)
+                if declared_length > max_bytes:
+                    logger.warning(f"Avatar too large ({declared_length} bytes) for {user_id}")
+                    return None
+                
+                # Determinar extensión
+                content_type = response.headers.get('content-type', 'image/jpeg')
+                extension = AvatarManager._get_extension_from_content_type(content_type)
+                
+                if not extension:
+                    logger.warning(f"Unknown content type {content_type}, using .jpg")
+                    extension = '.jpg'
+                
+                # Crear directorio solo la primera vez por proceso (initialize lo recuerda)
+                AvatarManager.initialize(platform)
+                
+                # Generar nombre de archivo basado en user_id
+                filename = f"{user_id}{extension}"
+                filepath = f"{avatars_dir}{os.sep}{filename}"
+                
+                # Guardar archivo localmente como caché. Se escribe en .part y se
+                # renombra al final: una descarga cortada nunca deja un avatar a medias.
+                # Content-Length es el tamaño comprimido: el límite se aplica también
+                # a lo ya descomprimido, leyendo como mucho max_bytes + 1
+                tmp_path = _tmp_path_for(filepath)
+                try:
+                    if 0 < declared_length <= SMALL_AVATAR_BYTES:
+                        # Avatar pequeño: una lectura y una escritura directa al fd
+                        data = response.raw.read(max_bytes + 1)
+                        _write_small_file(tmp_path, data)
+                        content_length = len(data)
+                    else:
+                        with open(tmp_path, 'wb', buffering=65536) as f:
+                            content_length = _copy_limited(response.raw, f, max_bytes + 1)
+                except FileNotFoundError:
+                    # Directorio borrado en caliente: que la próxima descarga lo recree
+                    _initialized_platforms.discard(platform)
+                    raise
+                except BaseException:
+                    _unlink_quiet(tmp_path)
+                    raise
+                
+                etag = response.headers.get('etag')
+                last_modified = response.headers.get('last-modified')
+            
+            # Sin Content-Length (chunked) el límite se comprueba al terminar
+            if content_length > max_bytes:
+                _unlink_quiet(tmp_path)
                 logger.warning(f"Avatar too large ({content_length} bytes) for {user_id}")
                 return None
             
-            # Determinar extensión
-            content_type = response.headers.get('content-type', 'image/jpeg')
-            extension = AvatarManager._get_extension_from_content_type(content_type)
-            
-            if not extension:
-                logger.warning(f"Unknown content type {content_type}, using .jpg")
-                extension = '.jpg'
-            
-            # Crear directorio si no existe
-            avatars_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generar nombre de archivo basado en user_id
-            filename = f"{user_id}{extension}"
-            filepath = avatars_dir / filename
-            
-            # Guardar archivo localmente como caché
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            # Con Pillow se guarda una copia reducida en WebP en lugar del original
+            webp_tmp_path = _tmp_path_for(f"{avatars_dir}{os.sep}{user_id}.webp", "transcode")
+            if _transcode_to_webp(tmp_path, webp_tmp_path):
+                _unlink_quiet(tmp_path)
+                tmp_path = webp_tmp_path
+                extension = ".webp"
+                filename = f"{user_id}{extension}"
+                filepath = f"{avatars_dir}{os.sep}{filename}"
             
-            logger.debug(f"Avatar cached locally ({platform}): {filename} ({content_length} bytes)")
+            # Se olvida antes del replace: nadie debe copiar filepath como si aún
+            # tuviera el avatar de la URL anterior
+            _forget_file(filepath)
+            os.replace(tmp_path, filepath)
+            _remove_sibling_avatars(avatars_dir, user_id, extension)
+            _remember_cached_url(platform, user_id, avatar_url_remote)
+            _remember_file_hash(url_hash, filepath)
+            # Se guarda aunque no haya validadores HTTP: basta para el atajo por mtime
+            _store_validator(validator_key, {
+                "platform": platform,
+                "file": filename,
+                "etag": etag,
+                "last_modified": last_modified,
+            })
+            logger.debug("Avatar cached locally (%s): %s (%d bytes)", platform, filename, content_length)
             
             # ⭐ DEVOLVER LA URL REMOTA EN LUGAR DE RUTA LOCAL
             # Discord y otros servicios necesitan URLs HTTP/HTTPS
             return avatar_url_remote
             
-        except requests.RequestException as e:
+        except _request_exception() as e:
             status_code = getattr(getattr(e, "response", None), "status_code", None)
             is_404 = status_code == 404 or "404" in str(e)
 
@@ -139,9 +662,9 @@ class AvatarManager:
             if platform == "discord" and is_404:
                 cached_local = AvatarManager.get_avatar_local_path(user_id, platform)
                 if cached_local:
-                    logger.debug(f"Avatar 404 para {user_id} (discord). Se usa cache local.")
+                    logger.debug("Avatar 404 para %s (discord). Se usa cache local.", user_id)
                 else:
-                    logger.debug(f"Avatar 404 para {user_id} (discord). Sin cache local.")
+                    logger.debug("Avatar 404 para %s (discord). Sin cache local.", user_id)
                 return avatar_url_remote
 
             logger.error(f"❌ Error downloading avatar for {user_id} ({platform}): {e}")
@@ -150,6 +673,64 @@ class AvatarManager:
             logger.error(f"❌ Unexpected error saving avatar {user_id} ({platform}): {e}")
             return None
     
+    @staticmethod
+    async def download_avatar_async(
+        user_id: str,
+        avatar_url_remote: str,
+        platform: Literal["youtube", "discord"] = "youtube"
+    ) -> Optional[str]:
+        """
+        Versión async de download_avatar para usar desde el event loop.
+        
+        La descarga corre en un hilo, así varias llamadas combinadas con
+        asyncio.gather solapan sus peticiones HTTP en lugar de sumarlas.
+        
+        Args:
+            user_id: ID del usuario (channel_id para YouTube, discord_id para Discord)
+            avatar_url_remote: URL remoto del avatar
+            platform: Plataforma ("youtube" o "discord")
+            
+        Returns:
+            str: URL remoto del avatar (para BD), o None si falló
+        """
+        return await asyncio.to_thread(
+            AvatarManager.download_avatar, user_id, avatar_url_remote, platform
+        )
+    
+    @staticmethod
+    async def download_many(
+        items: List[Tuple[str, str, str]],
+        concurrency: int = DOWNLOAD_CONCURRENCY
+    ) -> List[Optional[str]]:
+        """
+        Descarga un lote de avatares en paralelo sobre la sesión HTTP compartida.
+        
+        Las conexiones keep-alive/TLS del pool se reutilizan entre todo el lote;
+        el semáforo limita cuántas descargas hay en vuelo a la vez.
+        
+        Args:
+            items: Lista de (user_id, avatar_url_remote, platform)
+            concurrency: Máximo de descargas simultáneas
+            
+        Returns:
+            Lista con el resultado de download_avatar por item (None si falló),
+            en el mismo orden que items
+        """
+        if not items:
+            return []
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(user_id: str, avatar_url_remote: str, platform: str) -> Optional[str]:
+            async with semaphore:
+                return await AvatarManager.download_avatar_async(user_id, avatar_url_remote, platform)
+        
+        results = await asyncio.gather(
+            *(fetch_one(user_id, url, platform) for user_id, url, platform in items),
+            return_exceptions=True,
+        )
+        return [None if isinstance(result, BaseException) else result for result in results]
+    
     @staticmethod
     def detect_avatar_change(
         user_id: str,
@@ -198,12 +779,12 @@ class AvatarManager:
         Returns:
             Ruta del archivo si existe, None si no
         """
-        avatars_dir = AVATARS_YOUTUBE if platform == "youtube" else AVATARS_DISCORD
-        media_path = "media/yt_avatars" if platform == "youtube" else "media/dc_avatars"
+        _, media_path, avatars_dir = _PLATFORM_DIRS.get(platform, _PLATFORM_DIRS["discord"])
         
+        # Rutas como str + os.path.isfile: un stat por extensión sin crear objetos Path
+        base = os.path.join(avatars_dir, str(user_id))
         for ext in AvatarManager.ALLOWED_EXTENSIONS:
-            filepath = avatars_dir / f"{user_id}{ext}"
-            if filepath.exists():
+            if os.path.isfile(base + ext):
                 return f"{media_path}/{user_id}{ext}"
         
         return None
@@ -245,23 +826,43 @@ class AvatarManager:
         Returns:
             Cantidad de archivos eliminados
         """
-        avatars_dir = AVATARS_YOUTUBE if platform == "youtube" else AVATARS_DISCORD
+        avatars_dir = _PLATFORM_DIRS.get(platform, _PLATFORM_DIRS["discord"])[2]
         deleted_count = 0
+        deleted_files = set()
+        active_ids = set(active_user_ids)
         
         try:
-            for filepath in avatars_dir.glob('*'):
-                if not filepath.is_file():
-                    continue
-                
-                user_id = filepath.stem  # Nombre sin extensión
-                
-                if user_id not in active_user_ids:
-                    try:
-                        filepath.unlink()
-                        deleted_count += 1
-                        logger.debug(f"Cleaned up ({platform}): {filepath.name}")
-                    except Exception as e:
-                        logger.error(f"Error deleting avatar {filepath.name}: {e}")
+            # os.scandir reutiliza el tipo de archivo leído junto al directorio,
+            # evitando un stat() extra por archivo como hacía Path.glob + is_file
+            with os.scandir(avatars_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    
+                    # Temporales de una descarga (p. ej. A.jpg.123-456.part): splitext
+                    # los tomaría por otro usuario y borraría una descarga en curso
+                    if entry.name.endswith(_TMP_SUFFIXES):
+                        try:
+                            if time.time() - entry.stat().st_mtime > TMP_FILE_MAX_AGE_SECONDS:
+                                os.unlink(entry.path)
+                        except OSError:
+                            pass
+                        continue
+                    
+                    user_id = os.path.splitext(entry.name)[0]  # Nombre sin extensión
+                    
+                    if user_id not in active_ids:
+                        try:
+                            _forget_file(entry.path)
+                            os.unlink(entry.path)
+                            _forget_cached_url(platform, user_id)
+                            deleted_files.add(entry.name)
+                            deleted_count += 1
+                            logger.debug("Cleaned up (%s): %s", platform, entry.name)
+                        except Exception as e:
+                            logger.error(f"Error deleting avatar {entry.name}: {e}")
+            
+            _drop_validators_for_files(platform, deleted_files)
             
             if deleted_count > 0:
                 logger.info(f"✅ Cleanup ({platform}): {deleted_count} unused avatars removed")
@@ -293,7 +894,7 @@ class AvatarManager:
             return None
         
         try:
-            avatars_dir = AVATARS_YOUTUBE if platform == "youtube" else AVATARS_DISCORD
+            avatars_dir = _PLATFORM_DIRS.get(platform, _PLATFORM_DIRS["discord"])[0]
             filename = Path(local_path).name
             filepath = avatars_dir / filename
             
@@ -4,12 +4,14 @@ Funciones robustas para consultar y gestionar puntos en todas las plataformas.
 """
 from __future__ import annotations
 
+import copy
 import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, List
 
 from backend.database import get_connection
+from backend.managers import user_cache_manager
 from backend.managers.link_manager import resolve_active_user_id
 from backend.managers.user_manager import (
 	get_discord_profile_by_discord_id,
@@ -19,6 +21,10 @@ from backend.managers.user_manager import (
 
 SUPPORTED_PLATFORMS = ("discord", "youtube")
 
+# Resuelto una sola vez: _enqueue_progress_event corre en cada cambio de saldo
+EXTERNAL_EVENTS_DIR = Path(__file__).resolve().parents[1] / "data" / "discord_bot"
+EXTERNAL_EVENTS_FILE = EXTERNAL_EVENTS_DIR / "economy_external_events.json"
+
 
 def _round_amount(value: float | int) -> float:
 	return round(float(value), 2)
@@ -32,9 +38,8 @@ def _enqueue_progress_event(
 ) -> None:
 	"""Encola eventos de progreso económico para que Discord los publique en economy_channel."""
 	try:
-		data_dir = Path(__file__).resolve().parents[1] / "data" / "discord_bot"
-		queue_file = data_dir / "economy_external_events.json"
-		data_dir.mkdir(parents=True, exist_ok=True)
+		queue_file = EXTERNAL_EVENTS_FILE
+		EXTERNAL_EVENTS_DIR.mkdir(parents=True, exist_ok=True)
 
 		event = {
 			"platform": str(platform).strip().lower(),
@@ -54,8 +59,9 @@ def _enqueue_progress_event(
 				queue = []
 
 		queue.append(event)
+		# Cola interna (no se edita a mano): JSON compacto con el encoder en C de una sola pasada
 		with open(queue_file, "w", encoding="utf-8") as file:
-			json.dump(queue, file, indent=2, ensure_ascii=False)
+			file.write(json.dumps(queue, ensure_ascii=False, separators=(",", ":")))
 	except Exception:
 		pass
 
@@ -168,6 +174,8 @@ def _sync_wallet_total(conn, user_id: int, now_iso: str) -> float:
 		""",
 		(user_id, total, now_iso, now_iso),
 	)
+	# El cache se invalida en el llamador tras conn.commit(): invalidar aquí, con la
+	# transacción abierta, dejaría que una lectura concurrente cachee el saldo viejo
 	return total
 
 
@@ -306,6 +314,7 @@ def award_message_points(
 		)
 
 		conn.commit()
+		user_cache_manager.invalidate_user(user_id)
 		return {"awarded": 1, "points_added": amount, "global_points": global_points}
 	except Exception:
 		conn.rollback()
@@ -401,6 +410,7 @@ def award_youtube_message_points(
 		)
 
 		conn.commit()
+		user_cache_manager.invalidate_user(user_id)
 		return {"awarded": 1, "points_added": amount, "global_points": global_points}
 	except Exception:
 		conn.rollback()
@@ -413,8 +423,17 @@ def award_youtube_message_points(
 # FUNCIONES DE CONSULTA DE PUNTOS (ROBUSTAS)
 # ============================================================
 
+# Segundos que se reutiliza un balance mostrado (se invalida al modificar la wallet)
+BALANCE_CACHE_TTL_SECONDS = 30.0
+
+
 def get_user_balance_by_id(user_id: int) -> Dict[str, any]:
-	"""Obtiene el balance completo de un usuario por ID universal."""
+	"""
+	Obtiene el balance completo de un usuario por ID universal.
+
+	Siempre lee la BD: lo usan las comprobaciones de compra/apuesta. Para solo
+	mostrar el saldo usar get_user_balance_for_display.
+	"""
 	resolved_user_id = resolve_active_user_id(int(user_id))
 	conn = get_connection()
 	try:
@@ -432,6 +451,7 @@ def get_user_balance_by_id(user_id: int) -> Dict[str, any]:
 
 		return {
 			"user_exists": True,
+			"user_id": resolved_user_id,
 			"global_points": global_points,
 			"platform_balances": platform_balances,
 		}
@@ -439,6 +459,29 @@ def get_user_balance_by_id(user_id: int) -> Dict[str, any]:
 		conn.close()
 
 
+def get_user_balance_for_display(user_id: int) -> Dict[str, any]:
+	"""
+	Balance para mostrar en embeds/mensajes, cacheado BALANCE_CACHE_TTL_SECONDS.
+
+	No usar para decidir si un usuario puede pagar: para eso get_user_balance_by_id.
+	"""
+	def load() -> Optional[Dict[str, any]]:
+		balance = get_user_balance_by_id(int(user_id))
+		# Usuario inexistente: no se cachea para que aparezca en cuanto se registre
+		return balance if balance["user_exists"] else None
+
+	balance = user_cache_manager.get_or_load(
+		int(user_id),
+		load,
+		namespace="balance",
+		ttl=BALANCE_CACHE_TTL_SECONDS,
+	)
+	if balance is None:
+		return {"user_exists": False, "global_points": 0.0, "platform_balances": {"discord": 0.0, "youtube": 0.0}}
+	# Copia para que el llamador no modifique la entrada cacheada
+	return copy.deepcopy(balance)
+
+
 def get_user_balance_by_discord_id(discord_id: str) -> Optional[Dict[str, any]]:
 	profile = get_discord_profile_by_discord_id(str(discord_id))
 	if not profile:
@@ -573,6 +616,7 @@ def apply_balance_delta(
 		)
 
 		conn.commit()
+		user_cache_manager.invalidate_user(resolved_user_id)
 
 		final_total = _round_amount(new_total)
 		if platform == "discord":
@@ -670,6 +714,8 @@ def transfer_points(
 		from_balance = _sync_wallet_total(conn, from_user_id, now_iso)
 		to_balance = _sync_wallet_total(conn, to_user_id, now_iso)
 		conn.commit()
+		user_cache_manager.invalidate_user(from_user_id)
+		user_cache_manager.invalidate_user(to_user_id)
 
 		if platform == "discord":
 			from_profile = get_discord_profile_by_user_id(from_user_id)
@@ -3,10 +3,12 @@ Inventory Manager for PowerBot.
 Gestiona inventarios de usuarios (posesión de items).
 """
 from __future__ import annotations
+import copy
 from datetime import datetime
 from typing import Dict, Optional, List
 from backend.database import get_connection
 from backend.managers import items_manager
+from backend.managers import user_cache_manager
 
 
 def _ensure_inventory_tables(conn) -> None:
@@ -125,6 +127,7 @@ def add_item_to_user(
             total = quantity
         
         conn.commit()
+        user_cache_manager.invalidate_user(user_id)
         
         return {
             "success": True,
@@ -259,6 +262,7 @@ def remove_item_from_user(
             )
         
         conn.commit()
+        user_cache_manager.invalidate_user(user_id)
         
         return {
             "success": True,
@@ -316,6 +320,10 @@ def user_has_item(user_id: int, item_id: int) -> bool:
     return get_user_item_quantity(user_id, item_id) > 0
 
 
+# Segundos que se reutilizan las estadísticas (se invalidan al modificar el inventario)
+INVENTORY_STATS_TTL_SECONDS = 30.0
+
+
 def get_inventory_stats(user_id: int) -> Dict[str, any]:
     """
     Obtiene estadísticas agregadas del inventario de un usuario.
@@ -329,6 +337,18 @@ def get_inventory_stats(user_id: int) -> Dict[str, any]:
             - total_quantity: int (cantidad total sumando todos)
             - stats_totales: Dict (suma de todos los stats)
     """
+    stats = user_cache_manager.get_or_load(
+        user_id,
+        lambda: _load_inventory_stats(user_id),
+        namespace="inventory",
+        ttl=INVENTORY_STATS_TTL_SECONDS,
+    )
+    # Copia para que el llamador no modifique la entrada cacheada
+    return copy.deepcopy(stats)
+
+
+def _load_inventory_stats(user_id: int) -> Dict[str, any]:
+    """Calcula las estadísticas del inventario directamente desde la BD."""
     conn = get_connection()
     try:
         _ensure_inventory_tables(conn)
@@ -407,6 +427,7 @@ def clear_user_inventory(user_id: int) -> Dict[str, any]:
             (user_id,)
         )
         conn.commit()
+        user_cache_manager.invalidate_user(user_id)
         
         return {
             "success": True,
@@ -2,8 +2,9 @@
 Herramienta CLI para gestión de items.
 Facilita la creación de nuevos items y la importación.
 """
+import os
 import sys
-sys.path.insert(0, 'c:\\Users\\jhon-\\Desktop\\PowerBot')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 import argparse
 from backend.managers.items_manager import (
@@ -10,6 +10,7 @@ from pathlib import Path
 import json
 import shutil
 from backend.database import get_connection
+from backend.managers import user_cache_manager
 
 
 # ============================================================
@@ -39,6 +40,14 @@ _ITEMS_BY_KEY: Dict[str, Dict] = {}
 # INICIALIZACIÓN
 # ============================================================
 
+def _print_block(title: str, lines: Optional[List[str]] = None) -> None:
+    """Imprime un encabezado (y sus líneas) con una sola llamada a print."""
+    block = ["", "=" * 60, title, "=" * 60]
+    if lines:
+        block.extend(lines)
+    print("\n".join(block))
+
+
 def _ensure_folders():
     """Crea las carpetas necesarias si no existen"""
     ASSETS_GACHA.mkdir(parents=True, exist_ok=True)
@@ -407,9 +416,7 @@ def import_gacha_items() -> Dict[str, any]:
         "by_rarity": {rarity: 0 for rarity in RARITY_LEVELS}
     }
     
-    print("\n" + "=" * 60)
-    print("📦 IMPORTANDO ITEMS DE GACHA")
-    print("=" * 60)
+    _print_block("📦 IMPORTANDO ITEMS DE GACHA")
     
     for rarity in RARITY_LEVELS:
         rarity_folder = ASSETS_GACHA / rarity
@@ -437,16 +444,18 @@ def import_gacha_items() -> Dict[str, any]:
             else:
                 results["failed"] += 1
     
-    print("\n" + "=" * 60)
-    print("✅ RESUMEN DE IMPORTACIÓN - GACHA")
-    print("=" * 60)
-    print(f"Total procesados: {results['total']}")
-    print(f"Exitosos: {results['successful']}")
-    print(f"Fallidos: {results['failed']}")
-    print("\nPor rareza:")
-    for rarity, count in results["by_rarity"].items():
-        if count > 0:
-            print(f"  {rarity.capitalize()}: {count}")
+    summary = [
+        f"Total procesados: {results['total']}",
+        f"Exitosos: {results['successful']}",
+        f"Fallidos: {results['failed']}",
+        "\nPor rareza:",
+    ]
+    summary.extend(
+        f"  {rarity.capitalize()}: {count}"
+        for rarity, count in results["by_rarity"].items()
+        if count > 0
+    )
+    _print_block("✅ RESUMEN DE IMPORTACIÓN - GACHA", summary)
     
     return results
 
@@ -467,9 +476,7 @@ def import_store_items() -> Dict[str, any]:
         "ignored": 0,
     }
     
-    print("\n" + "=" * 60)
-    print("🏪 IMPORTANDO ITEMS DE TIENDA")
-    print("=" * 60)
+    _print_block("🏪 IMPORTANDO ITEMS DE TIENDA")
     
     if not ASSETS_STORE.exists():
         print("⚠️ No existe la carpeta de tienda")
@@ -503,13 +510,12 @@ def import_store_items() -> Dict[str, any]:
         else:
             results["failed"] += 1
     
-    print("\n" + "=" * 60)
-    print("✅ RESUMEN DE IMPORTACIÓN - TIENDA")
-    print("=" * 60)
-    print(f"Total procesados: {results['total']}")
-    print(f"Exitosos: {results['successful']}")
-    print(f"Fallidos: {results['failed']}")
-    print(f"Ignorados (no-card): {results['ignored']}")
+    _print_block("✅ RESUMEN DE IMPORTACIÓN - TIENDA", [
+        f"Total procesados: {results['total']}",
+        f"Exitosos: {results['successful']}",
+        f"Fallidos: {results['failed']}",
+        f"Ignorados (no-card): {results['ignored']}",
+    ])
     
     return results
 
@@ -536,13 +542,12 @@ def import_all_items() -> Dict[str, any]:
         "cached_items": cached
     }
     
-    print("\n" + "=" * 60)
-    print("🎉 IMPORTACIÓN COMPLETA")
-    print("=" * 60)
-    print(f"Total procesados: {total_results['total_items']}")
-    print(f"Exitosos: {total_results['total_successful']}")
-    print(f"Fallidos: {total_results['total_failed']}")
-    print(f"Items en caché: {total_results['cached_items']}")
+    _print_block("🎉 IMPORTACIÓN COMPLETA", [
+        f"Total procesados: {total_results['total_items']}",
+        f"Exitosos: {total_results['total_successful']}",
+        f"Fallidos: {total_results['total_failed']}",
+        f"Items en caché: {total_results['cached_items']}",
+    ])
     
     return total_results
 
@@ -653,9 +658,7 @@ def sync_existing_items() -> Dict[str, any]:
         else:
             results["failed"] += 1
 
-    print("\n" + "=" * 60)
-    print("🔄 SINCRONIZACIÓN DE ITEMS EXISTENTES")
-    print("=" * 60)
+    _print_block("🔄 SINCRONIZACIÓN DE ITEMS EXISTENTES")
 
     for rarity in RARITY_LEVELS:
         rarity_folder = ASSETS_GACHA / rarity
@@ -695,6 +698,7 @@ def sync_existing_items() -> Dict[str, any]:
                     tuple(item_ids_to_delete),
                 )
                 conn.commit()
+                user_cache_manager.clear()
                 results["deleted"] = len(item_ids_to_delete)
                 print(f"  🗑️ Eliminados de DB por no existir en assets: {results['deleted']}")
         finally:
@@ -706,17 +710,17 @@ def sync_existing_items() -> Dict[str, any]:
     cached = _refresh_cache()
     results["cached_items"] = cached
 
-    print("\n" + "=" * 60)
-    print("✅ RESUMEN SINCRONIZACIÓN")
-    print("=" * 60)
-    print(f"Procesados: {results['processed']}")
-    print(f"Actualizados/sin cambios: {results['updated_or_kept']}")
-    print(f"Omitidos (nuevos): {results['skipped_new']}")
-    print(f"Eliminados (no existen en assets): {results['deleted']}")
-    print(f"Fallidos: {results['failed']}")
+    summary = [
+        f"Procesados: {results['processed']}",
+        f"Actualizados/sin cambios: {results['updated_or_kept']}",
+        f"Omitidos (nuevos): {results['skipped_new']}",
+        f"Eliminados (no existen en assets): {results['deleted']}",
+        f"Fallidos: {results['failed']}",
+    ]
     if results["prune_skipped"]:
-        print("Prune: omitido por errores")
-    print(f"En caché: {results['cached_items']}")
+        summary.append("Prune: omitido por errores")
+    summary.append(f"En caché: {results['cached_items']}")
+    _print_block("✅ RESUMEN SINCRONIZACIÓN", summary)
 
     return results
 
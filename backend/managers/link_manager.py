@@ -16,6 +16,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from backend.database import get_connection
+from backend.managers import user_cache_manager
 from backend.managers.user_manager import (
 	get_or_create_discord_user,
 )
@@ -568,6 +569,7 @@ def consume_youtube_link_code(
 		)
 
 		conn.commit()
+		user_cache_manager.clear()
 		return LinkConsumeResult(
 			success=True,
 			message="Cuentas vinculadas correctamente",
@@ -811,6 +813,7 @@ def unlink_from_discord(discord_user_id: str) -> UnlinkResult:
 			return result
 
 		conn.commit()
+		user_cache_manager.clear()
 		return result
 	except Exception as exc:
 		conn.rollback()
@@ -841,6 +844,7 @@ def unlink_from_youtube(youtube_channel_id: str) -> UnlinkResult:
 			return result
 
 		conn.commit()
+		user_cache_manager.clear()
 		return result
 	except Exception as exc:
 		conn.rollback()
@@ -950,6 +954,7 @@ def force_link_discord_to_universal(
 
 		_sync_total_wallet(conn, target_user_id)
 		conn.commit()
+		user_cache_manager.clear()
 
 		return ForceLinkResult(
 			success=True,
@@ -0,0 +1,175 @@
+"""
+Cache en memoria (cache-aside con TTL) para datos de usuario de lectura frecuente.
+
+Pensado para /id y consultas similares: el primer acceso carga desde la BD y
+los siguientes, durante TTL_SECONDS, se sirven desde memoria. Los managers que
+modifican saldo, inventario, perfiles o vínculos invalidan al usuario afectado.
+
+Uso básico:
+    from backend.managers import user_cache_manager
+
+    profile = user_cache_manager.get_or_load(user_id, lambda: cargar(user_id))
+    profile = user_cache_manager.peek(user_id)  # sin cargar, seguro en el event loop
+    stats = user_cache_manager.get_or_load(user_id, cargar_stats, namespace="inventory", ttl=30)
+    user_cache_manager.invalidate_user(user_id)
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+# Segundos que una entrada se considera válida
+TTL_SECONDS = 60.0
+
+# (namespace, user_id) -> (expira_en, valor)
+_cache: Dict[Tuple[str, int], Tuple[float, Any]] = {}
+_lock = threading.Lock()
+
+# user_id -> claves de _cache que lo contienen (pedidas con ese ID o resueltas a
+# él por vínculo), para que invalidate_user no recorra todo el cache
+_keys_by_user: Dict[int, Set[Tuple[str, int]]] = {}
+
+# Generaciones: contador global que avanza en cada invalidación. Se recuerda la
+# última generación en que se invalidó cada usuario (y la del último clear()),
+# para que una carga que empezó antes no vuelva a guardar un valor ya obsoleto.
+# Solo importan las invalidaciones posteriores a la carga en curso más antigua:
+# _inflight cuenta las cargas por generación de inicio y permite podar el resto.
+_generation = 0
+_invalidated_gen: Dict[int, int] = {}
+_cleared_gen = 0
+_inflight: Dict[int, int] = {}
+
+
+def _is_stale(user_ids, start_gen: int) -> bool:
+    """True si alguno de los usuarios (o todo el cache) se invalidó tras start_gen. Llamar con el lock."""
+    if _cleared_gen > start_gen:
+        return True
+    return any(_invalidated_gen.get(uid, 0) > start_gen for uid in user_ids)
+
+
+def _finish_load(start_gen: int) -> None:
+    """Da por terminada una carga y poda generaciones que ya nadie consulta. Llamar con el lock."""
+    remaining = _inflight[start_gen] - 1
+    if remaining:
+        _inflight[start_gen] = remaining
+        return
+    del _inflight[start_gen]
+    if not _inflight:
+        _invalidated_gen.clear()
+    elif start_gen < min(_inflight):
+        oldest = min(_inflight)
+        for uid in [uid for uid, gen in _invalidated_gen.items() if gen <= oldest]:
+            del _invalidated_gen[uid]
+
+
+def get_or_load(
+    user_id: int,
+    loader: Callable[[], Any],
+    namespace: str = "profile",
+    ttl: float = TTL_SECONDS,
+) -> Any:
+    """
+    Devuelve el valor cacheado para user_id o lo carga con loader().
+
+    Los resultados None no se cachean (usuario inexistente o error), para
+    que un usuario recién creado aparezca en la siguiente consulta.
+
+    Args:
+        user_id: ID universal solicitado
+        loader: Función sin argumentos que consulta la BD
+        namespace: Tipo de dato cacheado ("profile", "balance", "inventory"...)
+        ttl: Segundos de validez de la entrada
+
+    Returns:
+        Valor cacheado o recién cargado
+    """
+    key = (namespace, int(user_id))
+    now = time.monotonic()
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        start_gen = _generation
+        _inflight[start_gen] = _inflight.get(start_gen, 0) + 1
+
+    try:
+        value = loader()
+    except BaseException:
+        with _lock:
+            _finish_load(start_gen)
+        raise
+
+    user_ids = {key[1]}
+    if isinstance(value, dict) and value.get('user_id') is not None:
+        user_ids.add(int(value['user_id']))
+    with _lock:
+        # Si hubo una invalidación durante la carga, se devuelve pero no se cachea
+        if value is not None and not _is_stale(user_ids, start_gen):
+            _cache[key] = (now + ttl, value)
+            for uid in user_ids:
+                _keys_by_user.setdefault(uid, set()).add(key)
+        _finish_load(start_gen)
+    return value
+
+
+def peek(user_id: int, namespace: str = "profile") -> Optional[Any]:
+    """
+    Devuelve el valor cacheado si sigue vigente, sin tocar la BD.
+
+    Útil desde el event loop para evitar el salto al executor cuando el
+    dato ya está en memoria.
+
+    Args:
+        user_id: ID universal solicitado
+        namespace: Tipo de dato cacheado
+
+    Returns:
+        Valor cacheado o None si no hay entrada vigente
+    """
+    key = (namespace, int(user_id))
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+    return None
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Elimina del cache todo lo relacionado con un usuario.
+
+    También borra entradas pedidas con otro ID que resolvieron a este
+    usuario (IDs vinculados), identificadas por su campo 'user_id'.
+
+    Args:
+        user_id: ID universal del usuario modificado
+    """
+    global _generation
+    user_id = int(user_id)
+    with _lock:
+        _generation += 1
+        # Sin cargas en curso nadie puede guardar un valor anterior a esta invalidación
+        if _inflight:
+            _invalidated_gen[user_id] = _generation
+        for cached_key in _keys_by_user.pop(user_id, ()):
+            _cache.pop(cached_key, None)
+
+
+def clear() -> None:
+    """Vacía el cache completo (cambios que afectan a muchos usuarios)."""
+    global _generation, _cleared_gen
+    with _lock:
+        _generation += 1
+        _cleared_gen = _generation
+        _invalidated_gen.clear()
+        _keys_by_user.clear()
+        _cache.clear()
+
+
+__all__ = [
+    'TTL_SECONDS',
+    'get_or_load',
+    'peek',
+    'invalidate_user',
+    'clear',
+]
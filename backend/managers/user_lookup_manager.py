@@ -13,10 +13,8 @@ Uso básico:
         print(f"Usuario: {user.display_name}")
         print(f"Puntos: {user.global_points}")
 """
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, Literal, Iterable
 from backend.managers.user_manager import (
-    get_discord_profile_by_discord_id,
-    get_youtube_profile_by_channel_id,
     get_youtube_profile_by_username,
     get_user_by_id,
     get_user_stats,
@@ -24,10 +22,35 @@ from backend.managers.user_manager import (
     YouTubeProfile,
     User
 )
-from backend.managers.link_manager import resolve_active_user_id
+from backend.database import get_connection
+from backend.managers import user_cache_manager
+from backend.managers.link_manager import _ensure_link_tables, _resolve_active_user_id_in_conn
 
 Platform = Literal["discord", "youtube", "global"]
 
+# Marca de "no consultado todavía" (None significa "consultado y no existe")
+_UNSET = object()
+
+# Máximo de parámetros por IN (...) para no pasar el límite de SQLite
+_IN_CHUNK_SIZE = 500
+
+# Tablas que lee get_user_full_profile ya comprobadas (una sola vez por proceso)
+_profile_tables_ready = False
+
+# Usuario + perfiles en una sola consulta; las búsquedas añaden su WHERE
+_LOOKUP_SELECT = """
+    SELECT
+        u.user_id, u.username, u.created_at, u.updated_at,
+        dp.id AS dp_id, dp.discord_id, dp.discord_username, dp.avatar_url,
+        dp.created_at AS dp_created_at, dp.updated_at AS dp_updated_at,
+        yp.id AS yp_id, yp.youtube_channel_id, yp.youtube_username,
+        yp.channel_avatar_url, yp.subscribers, yp.user_type,
+        yp.created_at AS yp_created_at, yp.updated_at AS yp_updated_at
+    FROM users u
+    LEFT JOIN discord_profile dp ON dp.user_id = u.user_id
+    LEFT JOIN youtube_profile yp ON yp.user_id = u.user_id
+"""
+
 
 class UserLookupResult:
     """
@@ -55,14 +78,14 @@ class UserLookupResult:
         
         # Cache interno para evitar consultas repetidas
         self._cached_stats = None
-        self._cached_user = None
-        self._cached_discord_profile = None
-        self._cached_youtube_profile = None
+        self._cached_user = _UNSET
+        self._cached_discord_profile = _UNSET
+        self._cached_youtube_profile = _UNSET
     
     @property
     def user(self) -> Optional[User]:
         """Obtiene el objeto User principal (lazy loading)"""
-        if self._cached_user is None:
+        if self._cached_user is _UNSET:
             self._cached_user = get_user_by_id(self.user_id)
         return self._cached_user
     
@@ -81,7 +104,7 @@ class UserLookupResult:
     @property
     def discord_profile(self) -> Optional[DiscordProfile]:
         """Obtiene perfil de Discord si existe"""
-        if self._cached_discord_profile is None:
+        if self._cached_discord_profile is _UNSET:
             from backend.managers.user_manager import get_discord_profile_by_user_id
             self._cached_discord_profile = get_discord_profile_by_user_id(self.user_id)
         return self._cached_discord_profile
@@ -89,7 +112,7 @@ class UserLookupResult:
     @property
     def youtube_profile(self) -> Optional[YouTubeProfile]:
         """Obtiene perfil de YouTube si existe"""
-        if self._cached_youtube_profile is None:
+        if self._cached_youtube_profile is _UNSET:
             from backend.managers.user_manager import get_youtube_profile_by_user_id
             self._cached_youtube_profile = get_youtube_profile_by_user_id(self.user_id)
         return self._cached_youtube_profile
@@ -174,6 +197,44 @@ class UserLookupResult:
         return True
 
 
+def _build_lookup_result(row, platform: Platform, platform_id: str) -> UserLookupResult:
+    """Crea un UserLookupResult con usuario y perfiles ya cargados desde _LOOKUP_SELECT."""
+    user_id = row['user_id']
+    result = UserLookupResult(
+        user_id=user_id,
+        platform=platform,
+        platform_id=platform_id
+    )
+    result._cached_user = User(user_id, row['username'], row['created_at'], row['updated_at'])
+    result._cached_discord_profile = None
+    if row['dp_id'] is not None:
+        result._cached_discord_profile = DiscordProfile(
+            row['dp_id'], user_id, row['discord_id'], row['discord_username'],
+            row['avatar_url'], row['dp_created_at'], row['dp_updated_at']
+        )
+    result._cached_youtube_profile = None
+    if row['yp_id'] is not None:
+        result._cached_youtube_profile = YouTubeProfile(
+            row['yp_id'], user_id, row['youtube_channel_id'], row['youtube_username'],
+            row['channel_avatar_url'], row['subscribers'], row['user_type'] or 'regular',
+            row['yp_created_at'], row['yp_updated_at']
+        )
+    return result
+
+
+def _find_one(where_sql: str, params: tuple, platform: Platform, platform_id: str) -> Optional[UserLookupResult]:
+    """Ejecuta _LOOKUP_SELECT con un WHERE y devuelve el primer resultado."""
+    conn = get_connection()
+    try:
+        row = conn.execute(f"{_LOOKUP_SELECT} WHERE {where_sql} LIMIT 1", params).fetchone()
+    finally:
+        conn.close()
+    
+    if not row:
+        return None
+    return _build_lookup_result(row, platform, platform_id)
+
+
 # ============================================================
 # FUNCIONES DE BÚSQUEDA POR PLATAFORMA
 # ============================================================
@@ -194,14 +255,7 @@ def find_user_by_discord_id(discord_id: str) -> Optional[UserLookupResult]:
         ...     print(f"Usuario: {user.display_name}")
         ...     print(f"Puntos: {user.global_points}")
     """
-    profile = get_discord_profile_by_discord_id(str(discord_id))
-    if profile:
-        return UserLookupResult(
-            user_id=profile.user_id,
-            platform="discord",
-            platform_id=str(discord_id)
-        )
-    return None
+    return _find_one("dp.discord_id = ?", (str(discord_id),), "discord", str(discord_id))
 
 
 def find_user_by_youtube_channel_id(youtube_channel_id: str) -> Optional[UserLookupResult]:
@@ -219,14 +273,7 @@ def find_user_by_youtube_channel_id(youtube_channel_id: str) -> Optional[UserLoo
         >>> if user:
         ...     print(f"Canal: {user.display_name}")
     """
-    profile = get_youtube_profile_by_channel_id(youtube_channel_id)
-    if profile:
-        return UserLookupResult(
-            user_id=profile.user_id,
-            platform="youtube",
-            platform_id=youtube_channel_id
-        )
-    return None
+    return _find_one("yp.youtube_channel_id = ?", (youtube_channel_id,), "youtube", youtube_channel_id)
 
 
 def find_user_by_youtube_username(youtube_username: str) -> Optional[UserLookupResult]:
@@ -248,15 +295,17 @@ def find_user_by_youtube_username(youtube_username: str) -> Optional[UserLookupR
 
     profile = get_youtube_profile_by_username(candidate)
     if profile:
-        return UserLookupResult(
+        result = UserLookupResult(
             user_id=profile.user_id,
             platform="youtube",
             platform_id=profile.youtube_channel_id
         )
+        result._cached_youtube_profile = profile
+        return result
     return None
 
 
-def find_user_by_global_id(user_id: int) -> Optional[UserLookupResult]:
+def find_user_by_global_id(user_id: int, conn=None) -> Optional[UserLookupResult]:
     """
     Busca un usuario por su ID global universal.
     
@@ -264,6 +313,7 @@ def find_user_by_global_id(user_id: int) -> Optional[UserLookupResult]:
     
     Args:
         user_id: ID único universal del usuario
+        conn: Conexión abierta a reutilizar (opcional; no se cierra aquí)
         
     Returns:
         UserLookupResult si el usuario existe, None si no
@@ -273,15 +323,78 @@ def find_user_by_global_id(user_id: int) -> Optional[UserLookupResult]:
         >>> if user:
         ...     print(f"Usuario ID 42: {user.display_name}")
     """
-    active_user_id = resolve_active_user_id(int(user_id))
-    user = get_user_by_id(active_user_id)
-    if user:
-        return UserLookupResult(
-            user_id=active_user_id,
-            platform="global",
-            platform_id=str(user_id)
-        )
-    return None
+    user_id = int(user_id)
+    return find_users_by_global_ids([user_id], conn=conn).get(user_id)
+
+
+def find_users_by_global_ids(user_ids: Iterable[int], conn=None) -> Dict[int, UserLookupResult]:
+    """
+    Versión por lotes de find_user_by_global_id.
+    
+    Resuelve los IDs vinculados y carga usuarios con sus perfiles de Discord y
+    YouTube con una consulta IN (...) en lugar de una por usuario. Los
+    resultados ya traen los perfiles cargados (sin lazy loading posterior).
+    
+    Args:
+        user_ids: IDs universales a buscar
+        conn: Conexión abierta a reutilizar (opcional; no se cierra aquí)
+        
+    Returns:
+        dict {ID pedido: UserLookupResult}; los IDs inexistentes no aparecen
+        
+    Example:
+        >>> users = find_users_by_global_ids([1, 2, 42])
+        >>> for user_id, user in users.items():
+        ...     print(user_id, user.display_name)
+    """
+    requested_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    if not requested_ids:
+        return {}
+    
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_connection()
+    try:
+        _ensure_link_tables(conn)
+        
+        active_by_requested = {user_id: user_id for user_id in requested_ids}
+        for start in range(0, len(requested_ids), _IN_CHUNK_SIZE):
+            chunk = requested_ids[start:start + _IN_CHUNK_SIZE]
+            placeholders = ",".join("?" for _ in chunk)
+            for row in conn.execute(
+                f"""
+                SELECT inactive_user_id, primary_user_id
+                FROM user_id_links
+                WHERE is_active = 1 AND inactive_user_id IN ({placeholders})
+                """,
+                chunk,
+            ):
+                active_by_requested[int(row['inactive_user_id'])] = int(row['primary_user_id'])
+        
+        active_ids = list(dict.fromkeys(active_by_requested.values()))
+        rows_by_user_id = {}
+        for start in range(0, len(active_ids), _IN_CHUNK_SIZE):
+            chunk = active_ids[start:start + _IN_CHUNK_SIZE]
+            placeholders = ",".join("?" for _ in chunk)
+            for row in conn.execute(
+                f"{_LOOKUP_SELECT} WHERE u.user_id IN ({placeholders})",
+                chunk,
+            ):
+                rows_by_user_id[int(row['user_id'])] = row
+    finally:
+        if owns_conn:
+            conn.close()
+    
+    results: Dict[int, UserLookupResult] = {}
+    for requested_id, active_id in active_by_requested.items():
+        row = rows_by_user_id.get(active_id)
+        if row is None:
+            continue
+        
+        result = _build_lookup_result(row, "global", str(requested_id))
+        results[requested_id] = result
+    
+    return results
 
 
 # ============================================================
@@ -448,6 +561,88 @@ def get_user_platform_ids(user_id: int) -> Dict[str, Optional[str]]:
     }
 
 
+def get_user_full_profile(user_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Carga en una sola consulta todo lo que muestra /id de un usuario.
+    
+    Reemplaza la secuencia lookup → get_user_balance_by_id → get_inventory_stats
+    (varias conexiones y round-trips) por un SELECT con LEFT JOIN a los perfiles
+    y subconsultas agregadas para saldo e inventario. Solo lectura: no sincroniza
+    la tabla wallets. El resultado se guarda en user_cache_manager (TTL corto);
+    los managers que modifican saldo, inventario o perfiles lo invalidan.
+    
+    Args:
+        user_id: ID global del usuario (se resuelve si está vinculado a otro)
+        
+    Returns:
+        dict con user_id, username, perfiles de Discord/YouTube, global_points
+        y total_quantity, o None si el usuario no existe
+    """
+    return user_cache_manager.get_or_load(user_id, lambda: _load_user_full_profile(user_id))
+
+
+def _load_user_full_profile(user_id: int) -> Optional[Dict[str, Any]]:
+    """Consulta de get_user_full_profile sin pasar por el cache."""
+    global _profile_tables_ready
+    
+    conn = get_connection()
+    try:
+        # Los CREATE TABLE IF NOT EXISTS solo hacen falta la primera vez;
+        # repetirlos en cada /id es DDL (y commits) en la ruta de lectura
+        if not _profile_tables_ready:
+            from backend.managers.economy_manager import _ensure_wallet_tables
+            from backend.managers.inventory_manager import _ensure_inventory_tables
+            
+            _ensure_link_tables(conn)
+            _ensure_wallet_tables(conn)
+            _ensure_inventory_tables(conn)
+            _profile_tables_ready = True
+        
+        active_user_id = _resolve_active_user_id_in_conn(conn, int(user_id)) or int(user_id)
+        row = conn.execute(
+            """
+            SELECT
+                u.user_id,
+                u.username,
+                dp.discord_id,
+                dp.discord_username,
+                dp.avatar_url AS discord_avatar_url,
+                yp.youtube_channel_id,
+                yp.youtube_username,
+                yp.channel_avatar_url,
+                (SELECT COALESCE(SUM(pw.balance), 0) FROM platform_wallets pw
+                 WHERE pw.user_id = u.user_id) AS global_points,
+                (SELECT COALESCE(SUM(ui.quantity), 0) FROM user_inventory ui
+                 WHERE ui.user_id = u.user_id) AS total_quantity
+            FROM users u
+            LEFT JOIN discord_profile dp ON dp.user_id = u.user_id
+            LEFT JOIN youtube_profile yp ON yp.user_id = u.user_id
+            WHERE u.user_id = ?
+            """,
+            (active_user_id,),
+        ).fetchone()
+    finally:
+        conn.close()
+    
+    if not row:
+        return None
+    
+    return {
+        'user_id': row['user_id'],
+        'username': row['username'],
+        'discord_id': row['discord_id'],
+        'discord_username': row['discord_username'],
+        'discord_avatar_url': row['discord_avatar_url'],
+        'youtube_channel_id': row['youtube_channel_id'],
+        'youtube_username': row['youtube_username'],
+        'channel_avatar_url': row['channel_avatar_url'],
+        'global_points': round(float(row['global_points'] or 0), 2),
+        'total_quantity': int(row['total_quantity'] or 0),
+        'has_discord': row['discord_id'] is not None,
+        'has_youtube': row['youtube_channel_id'] is not None,
+    }
+
+
 # ============================================================
 # EXPORTACIONES
 # ============================================================
@@ -461,6 +656,7 @@ __all__ = [
     'find_user_by_youtube_channel_id',
     'find_user_by_youtube_username',
     'find_user_by_global_id',
+    'find_users_by_global_ids',
     
     # Búsqueda unificada
     'find_user',
@@ -469,6 +665,7 @@ __all__ = [
     # Utilidades
     'user_exists',
     'get_user_platform_ids',
+    'get_user_full_profile',
     
     # Tipos
     'Platform',
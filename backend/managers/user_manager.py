@@ -7,9 +7,10 @@ Estructura:
 - discord_profile: Perfil específico de Discord
 - youtube_profile: Perfil específico de YouTube (futuro)
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 from backend.database import get_connection
+from backend.managers import user_cache_manager
 
 
 # ============================================================
@@ -151,6 +152,7 @@ def delete_user(user_id: int) -> bool:
     conn.commit()
     rows_deleted = cursor.rowcount
     conn.close()
+    user_cache_manager.invalidate_user(user_id)
     
     return rows_deleted > 0
 
@@ -185,6 +187,7 @@ def create_discord_profile(user_id: int, discord_id: str, discord_username: str
         conn.commit()
         profile_id = cursor.lastrowid
         conn.close()
+        user_cache_manager.invalidate_user(user_id)
         
         return get_discord_profile_by_id(profile_id)
     except Exception as e:
@@ -277,22 +280,34 @@ def update_discord_profile(user_id: int, discord_username: str = None, avatar_ur
         avatar_url: Nuevo URL del avatar
         
     Returns:
-        bool: True si se actualizó
+        bool: True si el perfil existe (aunque ya tuviera esos valores)
     """
     conn = get_connection()
     cursor = conn.cursor()
     
+    cursor.execute("SELECT discord_username, avatar_url FROM discord_profile WHERE user_id = ?", (user_id,))
+    row = cursor.fetchone()
+    if not row:
+        conn.close()
+        return False
+    
     updates = ["updated_at = ?"]
     params = [datetime.now()]
     
-    if discord_username:
+    if discord_username and discord_username != row['discord_username']:
         updates.append("discord_username = ?")
         params.append(discord_username)
     
-    if avatar_url:
+    if avatar_url and avatar_url != row['avatar_url']:
         updates.append("avatar_url = ?")
         params.append(avatar_url)
     
+    # Se llama en cada mensaje de Discord: si nada cambió no se escribe ni se
+    # invalida el cache (/id y /balance de los usuarios activos)
+    if len(updates) == 1:
+        conn.close()
+        return True
+    
     params.append(user_id)
     
     query = f"UPDATE discord_profile SET {', '.join(updates)} WHERE user_id = ?"
@@ -300,6 +315,7 @@ def update_discord_profile(user_id: int, discord_username: str = None, avatar_ur
     conn.commit()
     success = cursor.rowcount > 0
     conn.close()
+    user_cache_manager.invalidate_user(user_id)
     
     return success
 
@@ -335,6 +351,7 @@ def create_youtube_profile(user_id: int, youtube_channel_id: str, youtube_userna
         conn.commit()
         profile_id = cursor.lastrowid
         conn.close()
+        user_cache_manager.invalidate_user(user_id)
         
         return get_youtube_profile_by_id(profile_id)
     except Exception as e:
@@ -360,7 +377,7 @@ def get_youtube_profile_by_channel_id(youtube_channel_id: str) -> Optional[YouTu
     conn.close()
     
     if row:
-        user_type = row.get('user_type', 'regular') if hasattr(row, 'get') else getattr(row, 'user_type', 'regular')
+        user_type = row['user_type'] or 'regular'
         return YouTubeProfile(
             row['id'], row['user_id'], row['youtube_channel_id'], row['youtube_username'],
             row['channel_avatar_url'], row['subscribers'], user_type, row['created_at'], row['updated_at']
@@ -413,7 +430,7 @@ def get_youtube_profile_by_username(youtube_username: str) -> Optional[YouTubePr
     conn.close()
 
     if row:
-        user_type = row.get('user_type', 'regular') if hasattr(row, 'get') else getattr(row, 'user_type', 'regular')
+        user_type = row['user_type'] or 'regular'
         return YouTubeProfile(
             row['id'], row['user_id'], row['youtube_channel_id'], row['youtube_username'],
             row['channel_avatar_url'], row['subscribers'], user_type, row['created_at'], row['updated_at']
@@ -439,7 +456,7 @@ def get_youtube_profile_by_id(profile_id: int) -> Optional[YouTubeProfile]:
     conn.close()
     
     if row:
-        user_type = row.get('user_type', 'regular') if hasattr(row, 'get') else getattr(row, 'user_type', 'regular')
+        user_type = row['user_type'] or 'regular'
         return YouTubeProfile(
             row['id'], row['user_id'], row['youtube_channel_id'], row['youtube_username'],
             row['channel_avatar_url'], row['subscribers'], user_type, row['created_at'], row['updated_at']
@@ -465,7 +482,7 @@ def get_youtube_profile_by_user_id(user_id: int) -> Optional[YouTubeProfile]:
     conn.close()
     
     if row:
-        user_type = row.get('user_type', 'regular') if hasattr(row, 'get') else getattr(row, 'user_type', 'regular')
+        user_type = row['user_type'] or 'regular'
         return YouTubeProfile(
             row['id'], row['user_id'], row['youtube_channel_id'], row['youtube_username'],
             row['channel_avatar_url'], row['subscribers'], user_type, row['created_at'], row['updated_at']
@@ -486,30 +503,44 @@ def update_youtube_profile(user_id: int, youtube_username: str = None, channel_a
         subscribers: Nuevo conteo de suscriptores
         
     Returns:
-        bool: True si se actualizó
+        bool: True si el perfil existe (aunque ya tuviera esos valores)
     """
     conn = get_connection()
     cursor = conn.cursor()
     
+    cursor.execute(
+        "SELECT youtube_username, channel_avatar_url, user_type, subscribers FROM youtube_profile WHERE user_id = ?",
+        (user_id,)
+    )
+    row = cursor.fetchone()
+    if not row:
+        conn.close()
+        return False
+    
     updates = ["updated_at = ?"]
     params = [datetime.now()]
     
-    if youtube_username:
+    if youtube_username and youtube_username != row['youtube_username']:
         updates.append("youtube_username = ?")
         params.append(youtube_username)
     
-    if channel_avatar_url:
+    if channel_avatar_url and channel_avatar_url != row['channel_avatar_url']:
         updates.append("channel_avatar_url = ?")
         params.append(channel_avatar_url)
     
-    if user_type:
+    if user_type and user_type != row['user_type']:
         updates.append("user_type = ?")
         params.append(user_type)
     
-    if subscribers is not None:
+    if subscribers is not None and subscribers != row['subscribers']:
         updates.append("subscribers = ?")
         params.append(subscribers)
     
+    # Mismos valores que en BD: sin escritura ni invalidación del cache
+    if len(updates) == 1:
+        conn.close()
+        return True
+    
     params.append(user_id)
     
     query = f"UPDATE youtube_profile SET {', '.join(updates)} WHERE user_id = ?"
@@ -517,10 +548,102 @@ def update_youtube_profile(user_id: int, youtube_username: str = None, channel_a
     conn.commit()
     success = cursor.rowcount > 0
     conn.close()
+    user_cache_manager.invalidate_user(user_id)
     
     return success
 
 
+def upsert_youtube_profiles_bulk(entries: List[Dict[str, Any]]) -> Dict[str, Tuple[int, bool, Optional[str]]]:
+    """
+    Crea o actualiza varios perfiles YouTube en una sola transacción.
+    
+    Pensado para el listener del chat: una página de mensajes se persiste con
+    un SELECT ... IN (...) y escrituras agrupadas en vez de varias consultas
+    (y conexiones) por mensaje.
+    
+    Args:
+        entries: Dicts con 'youtube_channel_id', 'youtube_username', 'user_type' y
+                 opcionalmente 'avatar_url_remote' (se guarda como channel_avatar_url).
+                 Si un canal aparece varias veces gana la última entrada.
+        
+    Returns:
+        dict {youtube_channel_id: (user_id, is_new, channel_avatar_url anterior)}
+    """
+    latest: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        channel_id = entry.get('youtube_channel_id')
+        if channel_id:
+            latest[channel_id] = entry
+    
+    if not latest:
+        return {}
+    
+    now = datetime.now()
+    results: Dict[str, Tuple[int, bool, Optional[str]]] = {}
+    
+    conn = get_connection()
+    try:
+        channel_ids = list(latest)
+        placeholders = ",".join("?" for _ in channel_ids)
+        rows = conn.execute(
+            f"""SELECT user_id, youtube_channel_id, youtube_username, user_type, channel_avatar_url
+                FROM youtube_profile WHERE youtube_channel_id IN ({placeholders})""",
+            channel_ids
+        ).fetchall()
+        existing = {row['youtube_channel_id']: row for row in rows}
+        
+        updates = []
+        new_profiles = []
+        for channel_id, entry in latest.items():
+            username = entry.get('youtube_username')
+            user_type = entry.get('user_type') or 'regular'
+            avatar_url = entry.get('avatar_url_remote') or None
+            row = existing.get(channel_id)
+            
+            if row:
+                if (
+                    row['youtube_username'] != username
+                    or row['user_type'] != user_type
+                    or (avatar_url and row['channel_avatar_url'] != avatar_url)
+                ):
+                    updates.append((username, user_type, avatar_url, now, row['user_id']))
+                results[channel_id] = (row['user_id'], False, row['channel_avatar_url'])
+                continue
+            
+            # Usuario universal nuevo: hace falta su lastrowid para el perfil
+            cursor = conn.execute(
+                "INSERT INTO users (username, created_at, updated_at) VALUES (?, ?, ?)",
+                (username or channel_id, now, now)
+            )
+            user_id = cursor.lastrowid
+            new_profiles.append((user_id, channel_id, username, user_type, avatar_url, now, now))
+            results[channel_id] = (user_id, True, None)
+        
+        if updates:
+            conn.executemany(
+                """UPDATE youtube_profile
+                   SET youtube_username = ?, user_type = ?,
+                       channel_avatar_url = COALESCE(?, channel_avatar_url), updated_at = ?
+                   WHERE user_id = ?""",
+                updates
+            )
+        if new_profiles:
+            conn.executemany(
+                """INSERT INTO youtube_profile
+                   (user_id, youtube_channel_id, youtube_username, user_type, channel_avatar_url, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                new_profiles
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    
+    for params in updates:
+        user_cache_manager.invalidate_user(params[-1])
+    
+    return results
+
+
 # ============================================================
 # OPERACIONES COMBINADAS (HELPERS)
 # ============================================================
@@ -13,12 +13,13 @@ import discord
 from discord.ext import commands
 
 # Configurar path ANTES de importar backend (necesario para ejecución directa)
-root_dir = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(root_dir))
+root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, root_dir)
 
 # Inicializar base de datos
 from backend.database import init_database
 from backend.managers import get_or_create_discord_user
+from backend.managers.avatar_manager import AvatarManager
 from backend.managers.economy_manager import get_user_balance_by_discord_id
 from backend.services.discord_bot.economy.earning import process_message_earning, process_voice_earning_in_channel
 from backend.services.discord_bot.economy.economy_channel import (
@@ -345,11 +346,14 @@ class PowerBotDiscord(commands.Bot):
             return
         
         try:
-            # Auto-registrar usuario
-            await self._auto_register_user(message.author)
+            # Auto-registrar usuario y verificar earning_channel a la vez:
+            # el chequeo del canal no depende del registro en BD
+            _, is_earning_channel = await asyncio.gather(
+                self._auto_register_user(message.author),
+                self._is_earning_channel(message.guild.id, message.channel.id),
+            )
             
-            # Verificar si es en earning_channel
-            if await self._is_earning_channel(message.guild.id, message.channel.id):
+            if is_earning_channel:
                 result = await asyncio.to_thread(
                     process_message_earning,
                     str(message.author.id),
@@ -446,18 +450,28 @@ class PowerBotDiscord(commands.Bot):
         try:
             avatar_url = str(user.avatar.url) if user.avatar else None
             
-            user_obj, discord_profile, is_new = await asyncio.to_thread(
+            # Registro en BD y descarga del avatar son independientes: en paralelo
+            # (el avatar se guarda por discord_id, no necesita el ID universal)
+            register_task = asyncio.to_thread(
                 get_or_create_discord_user,
                 str(user.id),
                 user.name,
                 avatar_url
             )
+            if avatar_url:
+                (user_obj, discord_profile, is_new), avatar_ready = await asyncio.gather(
+                    register_task,
+                    AvatarManager.download_avatar_async(str(user.id), avatar_url, "discord"),
+                )
+            else:
+                user_obj, discord_profile, is_new = await register_task
+                avatar_ready = None
             
             if is_new:
                 print(f"✨ Nuevo usuario registrado: {user.name} (ID: {user.id})")
             
-            # Descargar avatar si existe
-            if avatar_url and user_obj and user_obj.user_id:
+            # Guardar referencia del avatar (la descarga ya está en cache: no repite la petición)
+            if avatar_ready and user_obj and user_obj.user_id:
                 try:
                     await asyncio.to_thread(
                         DiscordAvatarPackager.download_and_update_avatar,
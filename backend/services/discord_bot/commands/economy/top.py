@@ -1,13 +1,15 @@
 """
 Comando /top para ranking de puntos.
 """
+import asyncio
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from backend.database import get_connection
+from backend.database import DB_EXECUTOR, get_connection
 from backend.managers.economy_manager import get_global_leaderboard
-from backend.managers.user_manager import get_discord_profile_by_user_id
+from backend.managers.user_lookup_manager import find_users_by_global_ids
 from backend.services.discord_bot.config.economy import get_economy_config
 
 
@@ -22,7 +24,12 @@ def setup_top_commands(bot: commands.Bot) -> None:
 		currency_name = economy_config.get_currency_name()
 		currency_symbol = economy_config.get_currency_symbol()
 
-		leaderboard = get_global_leaderboard(limit=10)
+		# Ranking global y posición del usuario son independientes: se cargan en paralelo
+		loop = asyncio.get_running_loop()
+		leaderboard, (user_position, user_points) = await asyncio.gather(
+			loop.run_in_executor(DB_EXECUTOR, get_global_leaderboard, 10),
+			loop.run_in_executor(DB_EXECUTOR, _get_user_rank_and_points, interaction.user.id),
+		)
 		if not leaderboard:
 			embed = discord.Embed(
 				title="Top 10",
@@ -32,11 +39,17 @@ def setup_top_commands(bot: commands.Bot) -> None:
 			await interaction.followup.send(embed=embed)
 			return
 
+		# Perfiles de todo el top en una sola consulta
+		lookups = await loop.run_in_executor(
+			DB_EXECUTOR, find_users_by_global_ids, [row.get("user_id") for row in leaderboard]
+		)
+
 		lines = []
 		for idx, row in enumerate(leaderboard, start=1):
 			username = row.get("username") or f"User {row.get('user_id')}"
 			balance = row.get("balance", 0)
-			discord_profile = get_discord_profile_by_user_id(row.get("user_id"))
+			lookup = lookups.get(int(row.get("user_id")))
+			discord_profile = lookup.discord_profile if lookup else None
 			if discord_profile:
 				display_name = f"<@{discord_profile.discord_id}>"
 			else:
@@ -46,7 +59,6 @@ def setup_top_commands(bot: commands.Bot) -> None:
 				f"    └─ `ID:{row.get('user_id')}`  •  **{balance:,.1f}{currency_symbol}**"
 			)
 
-		user_position, user_points = _get_user_rank_and_points(interaction.user.id)
 		if user_position:
 			if user_position <= 10:
 				footer_text = (
@@ -13,14 +13,17 @@ from typing import Optional, Any
 from datetime import datetime
 
 from backend.managers.user_lookup_manager import find_user_by_discord_id, find_user_by_global_id
-from backend.managers.economy_manager import get_user_balance_by_id, transfer_points
+from backend.managers.economy_manager import get_user_balance_for_display, transfer_points
 from backend.managers import get_or_create_discord_user
 from backend.managers.avatar_manager import AvatarManager
 from backend.services.discord_bot.config.economy import get_economy_config
 
 
+PROJECT_ROOT = Path(__file__).resolve().parents[5]
+
+
 def _project_root() -> Path:
-	return Path(__file__).resolve().parents[5]
+	return PROJECT_ROOT
 
 
 def _donation_data_dir() -> Path:
@@ -65,10 +68,9 @@ async def _resolve_avatar_url_for_target(
 		if not avatar_rel_path:
 			return None
 
+		# get_avatar_local_path solo devuelve rutas de archivos existentes; si se
+		# borrara justo ahora, discord.File falla y el except devuelve None
 		avatar_abs = _project_root() / avatar_rel_path
-		if not avatar_abs.exists() or not avatar_abs.is_file():
-			return None
-
 		return discord.File(avatar_abs, filename=avatar_abs.name)
 	except Exception:
 		return None
@@ -864,7 +866,7 @@ async def _show_own_balance(
 			)
 	
 	# Obtener balance
-	balance = get_user_balance_by_id(user_lookup.user_id)
+	balance = get_user_balance_for_display(user_lookup.user_id)
 	
 	if not balance or not balance["user_exists"]:
 		return discord.Embed(
@@ -922,7 +924,7 @@ async def _show_discord_user_balance(
 			)
 	
 	# Obtener balance
-	balance = get_user_balance_by_id(user_lookup.user_id)
+	balance = get_user_balance_for_display(user_lookup.user_id)
 	
 	if not balance or not balance["user_exists"]:
 		return discord.Embed(
@@ -964,7 +966,7 @@ async def _show_global_id_balance(
 		)
 	
 	# Obtener balance
-	balance = get_user_balance_by_id(user_lookup.user_id)
+	balance = get_user_balance_for_display(user_lookup.user_id)
 	
 	if not balance or not balance["user_exists"]:
 		return discord.Embed(
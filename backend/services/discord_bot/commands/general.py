@@ -7,13 +7,72 @@ from discord import app_commands
 from discord.ext import commands
 from typing import Optional
 
-from backend.managers.user_lookup_manager import find_user_by_discord_id, find_user_by_global_id
-from backend.managers.economy_manager import get_user_balance_by_id
-from backend.managers import inventory_manager
+from backend.database import DB_EXECUTOR
+from backend.managers import user_cache_manager
+from backend.managers.user_lookup_manager import (
+	find_user_by_discord_id,
+	find_user_by_global_id,
+	get_user_full_profile,
+)
 from backend.services.discord_bot.commands.economy.user_economy import send_donation_embed
 from backend.services.discord_bot.config.roles import get_roles_config
 
 
+def _build_id_embed(user_info: dict) -> discord.Embed:
+	"""Construye el embed de /id a partir de los datos precargados en el executor."""
+	platforms = []
+	if user_info['has_discord']:
+		platforms.append("Discord")
+	if user_info['has_youtube']:
+		platforms.append("YouTube")
+
+	platforms_text = " y ".join(platforms) if platforms else "Sin plataformas"
+
+	embed = discord.Embed(
+		title=f"🧾 ID de {user_info['display_name']}",
+		description=f"**ID Universal:** `{user_info['user_id']}`",
+		color=discord.Color.blue()
+	)
+
+	embed.add_field(
+		name="💰 Puntos",
+		value=f"{user_info['points']:,.2f}",
+		inline=True
+	)
+	embed.add_field(
+		name="🎒 Inventario",
+		value=f"{user_info['total_quantity']} items",
+		inline=True
+	)
+	embed.add_field(
+		name="🔗 Plataformas",
+		value=platforms_text,
+		inline=False
+	)
+
+	# Usar datos precargados, NO acceder a los perfiles aquí
+	if user_info['discord_info']:
+		embed.add_field(
+			name="Discord",
+			value=f"{user_info['discord_info']['username']} (`{user_info['discord_info']['id']}`)",
+			inline=False
+		)
+
+	if user_info['youtube_info']:
+		embed.add_field(
+			name="YouTube",
+			value=f"{user_info['youtube_info']['username']} (`{user_info['youtube_info']['channel_id']}`)",
+			inline=False
+		)
+
+	if user_info['avatar_url']:
+		# Solo establecer thumbnail si es una URL válida (http/https)
+		if user_info['avatar_url'].startswith(('http://', 'https://')):
+			embed.set_thumbnail(url=user_info['avatar_url'])
+
+	return embed
+
+
 def setup_general_commands(bot: commands.Bot) -> None:
 	"""Registra comandos generales"""
 
@@ -175,66 +234,89 @@ def setup_general_commands(bot: commands.Bot) -> None:
 				return find_user_by_global_id(user_global_id)
 		
 		def get_user_info(lookup, target_obj=None):
-			"""Carga TODA la información del usuario aquí en el executor"""
+			"""Carga TODA la información del usuario aquí en el executor (una sola consulta)"""
+			profile = get_user_full_profile(lookup.user_id) or {
+				'user_id': lookup.user_id,
+				'username': None,
+				'discord_id': None,
+				'discord_username': None,
+				'discord_avatar_url': None,
+				'youtube_channel_id': None,
+				'youtube_username': None,
+				'channel_avatar_url': None,
+				'global_points': 0.0,
+				'total_quantity': 0,
+				'has_discord': False,
+				'has_youtube': False,
+			}
+			return build_user_info(profile, target_obj)
+
+		def build_user_info(profile, target_obj=None):
+			"""Arma user_info a partir del perfil (sin acceso a BD)"""
 			if target_obj is not None:
 				display_name = target_obj.display_name
 				avatar_url = str(target_obj.display_avatar.url)
 			else:
-				display_name = lookup.display_name
-				avatar_url = None
-				
+				# Misma prioridad que UserLookupResult.display_name
+				display_name = (
+					profile['discord_username']
+					or profile['youtube_username']
+					or profile['username']
+					or f"User #{profile['user_id']}"
+				)
+
 				# Prioridad: Discord > YouTube para el avatar del embed
 				# Nota: Para usuarios de Discord buscados por ID, se obtiene el avatar en el thread principal
-				if lookup.discord_profile and lookup.discord_profile.avatar_url:
-					avatar_url = lookup.discord_profile.avatar_url
-				elif lookup.youtube_profile and lookup.youtube_profile.channel_avatar_url:
-					avatar_url = lookup.youtube_profile.channel_avatar_url
-			
-			balance = get_user_balance_by_id(lookup.user_id)
-			points = balance.get("global_points", 0) if balance.get("user_exists") else 0
-			points = round(float(points), 2)
-			
-			inventory_stats = inventory_manager.get_inventory_stats(lookup.user_id)
-			total_quantity = inventory_stats.get("total_quantity", 0)
-			
-			# Precargar información de plataformas aquí
-			has_discord = lookup.has_discord
-			has_youtube = lookup.has_youtube
-			
+				avatar_url = profile['discord_avatar_url'] or profile['channel_avatar_url']
+
 			discord_info = None
-			if lookup.discord_profile:
+			if profile['has_discord']:
 				discord_info = {
-					'username': lookup.discord_profile.discord_username or "Desconocido",
-					'id': lookup.discord_profile.discord_id
+					'username': profile['discord_username'] or "Desconocido",
+					'id': profile['discord_id']
 				}
-			
+
 			youtube_info = None
-			if lookup.youtube_profile:
+			if profile['has_youtube']:
 				youtube_info = {
-					'username': lookup.youtube_profile.youtube_username or "Desconocido",
-					'channel_id': lookup.youtube_profile.youtube_channel_id or "Desconocido"
+					'username': profile['youtube_username'] or "Desconocido",
+					'channel_id': profile['youtube_channel_id'] or "Desconocido"
 				}
-			
+
 			return {
-				'user_id': lookup.user_id,
+				'user_id': profile['user_id'],
 				'display_name': display_name,
 				'avatar_url': avatar_url,
-				'points': points,
-				'total_quantity': total_quantity,
-				'has_discord': has_discord,
-				'has_youtube': has_youtube,
+				'points': profile['global_points'],
+				'total_quantity': profile['total_quantity'],
+				'has_discord': profile['has_discord'],
+				'has_youtube': profile['has_youtube'],
 				'discord_info': discord_info,
 				'youtube_info': youtube_info
 			}
 
+		def load_id_info(target_id=None, user_global_id=None, target_obj=None):
+			"""Lookup + info + embed en un solo viaje al executor"""
+			lookup = load_user_data(target_id, user_global_id)
+			if not lookup:
+				return None, None
+			user_info = get_user_info(lookup, target_obj)
+			return user_info, _build_id_embed(user_info)
+
 		# Ejecutar las operaciones síncronas en un thread para no bloquear el bot
-		loop = asyncio.get_event_loop()
+		loop = asyncio.get_running_loop()
 		
-		# Cargar lookup del usuario
-		lookup = await loop.run_in_executor(None, load_user_data, 
-			str(target.id) if target else None, user_id)
+		# Consulta por ID universal ya cacheada: se resuelve aquí sin salto al executor
+		cached_profile = user_cache_manager.peek(user_id) if target is None else None
+		if cached_profile is not None:
+			user_info = build_user_info(cached_profile)
+			embed = _build_id_embed(user_info)
+		else:
+			# Cargar TODA la información del usuario (sin lazy loading después)
+			user_info, embed = await loop.run_in_executor(DB_EXECUTOR, load_id_info,
+				str(target.id) if target else None, user_id, target)
 		
-		if not lookup:
+		if not user_info:
 			embed = discord.Embed(
 				title="❌ Usuario no encontrado",
 				description=f"No existe registro para {target.mention if target else f'ID universal: {user_id}'}.",
@@ -242,69 +324,15 @@ def setup_general_commands(bot: commands.Bot) -> None:
 			)
 			await interaction.followup.send(embed=embed, ephemeral=True)
 			return
-		
-		# Cargar info del usuario (TODA la información aquí, sin lazy loading después)
-		user_info = await loop.run_in_executor(None, get_user_info, lookup, target)
 
 		# **AQUÍ en el thread principal: si es búsqueda por ID de Discord, obtener avatar en tiempo real**
-		if target is None and lookup.has_discord and lookup.discord_profile:
+		if target is None and user_info['discord_info']:
 			try:
 				# Obtener usuario de Discord en tiempo real del cache del bot
-				discord_user = interaction.client.get_user(int(lookup.discord_profile.discord_id))
+				discord_user = interaction.client.get_user(int(user_info['discord_info']['id']))
 				if discord_user:
-					user_info['avatar_url'] = str(discord_user.display_avatar.url)
+					embed.set_thumbnail(url=str(discord_user.display_avatar.url))
 			except (ValueError, TypeError):
-				pass  # Usar lo que esté en user_info['avatar_url'] (de BD, si existe)
-
-		# Ya NO accedemos a los perfiles en el thread principal, usamos los datos precargados
-		platforms = []
-		if user_info['has_discord']:
-			platforms.append("Discord")
-		if user_info['has_youtube']:
-			platforms.append("YouTube")
-
-		platforms_text = " y ".join(platforms) if platforms else "Sin plataformas"
-
-		embed = discord.Embed(
-			title=f"🧾 ID de {user_info['display_name']}",
-			description=f"**ID Universal:** `{user_info['user_id']}`",
-			color=discord.Color.blue()
-		)
-
-		embed.add_field(
-			name="💰 Puntos",
-			value=f"{user_info['points']:,.2f}",
-			inline=True
-		)
-		embed.add_field(
-			name="🎒 Inventario",
-			value=f"{user_info['total_quantity']} items",
-			inline=True
-		)
-		embed.add_field(
-			name="🔗 Plataformas",
-			value=platforms_text,
-			inline=False
-		)
-
-		# Usar datos precargados, NO acceder a los perfiles aquí
-		if user_info['discord_info']:
-			embed.add_field(
-				name="Discord",
-				value=f"{user_info['discord_info']['username']} (`{user_info['discord_info']['id']}`)",
-				inline=False
-			)
-
-		if user_info['youtube_info']:
-			embed.add_field(
-				name="YouTube",
-				value=f"{user_info['youtube_info']['username']} (`{user_info['youtube_info']['channel_id']}`)",
-				inline=False
-			)
-
-		if user_info['avatar_url']:
-			# Solo establecer thumbnail si es una URL válida (http/https)
-			if user_info['avatar_url'].startswith('http://') or user_info['avatar_url'].startswith('https://'):
-				embed.set_thumbnail(url=user_info['avatar_url'])
+				pass  # Usar el thumbnail ya puesto desde user_info['avatar_url'] (de BD, si existe)
 
 		await interaction.followup.send(embed=embed)
@@ -336,7 +336,7 @@ def _resolve_item_image(item: dict) -> dict:
 
 
 def _is_http_url(value: str) -> bool:
-    return value.startswith("http://") or value.startswith("https://")
+    return value.startswith(("http://", "https://"))
 
 
 def _resolve_local_image_path(image_url: str) -> Optional[Path]:
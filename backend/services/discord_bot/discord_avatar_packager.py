@@ -30,7 +30,7 @@ class DiscordAvatarPackager:
         """
         try:
             if not avatar_url:
-                logger.debug(f"No avatar URL for {discord_id}")
+                logger.debug("No avatar URL for %s", discord_id)
                 return False
             
             # Usar AvatarManager centralizado
@@ -47,7 +47,7 @@ class DiscordAvatarPackager:
                     avatar_url=local_path,
                 )
                 
-                logger.info(f"✅ Avatar updated (Discord): {discord_id} → {local_path}")
+                logger.info("✅ Avatar updated (Discord): %s → %s", discord_id, local_path)
                 return True
             else:
                 logger.warning(f"⚠️  Failed to download avatar for {discord_id}")
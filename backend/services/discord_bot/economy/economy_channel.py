@@ -56,8 +56,11 @@ MILESTONE_LEVELS = [
 BANKRUPTCY_THRESHOLD = 0.99
 
 
+DATA_DIR = Path(__file__).resolve().parents[3] / "data" / "discord_bot"
+
+
 def _data_dir() -> Path:
-	return Path(__file__).resolve().parents[3] / "data" / "discord_bot"
+	return DATA_DIR
 
 
 def _state_file(guild_id: int) -> Path:
@@ -68,6 +71,15 @@ def _external_events_file() -> Path:
 	return _data_dir() / "economy_external_events.json"
 
 
+def _dumps_queue(queue: list[dict[str, Any]]) -> str:
+	"""Serializa la cola de eventos externos en JSON compacto.
+
+	Sin indent, json usa su encoder en C y genera un solo string en vez de
+	escribir el archivo fragmento a fragmento.
+	"""
+	return json.dumps(queue, ensure_ascii=False, separators=(",", ":"))
+
+
 def _load_state(guild_id: int) -> dict[str, Any]:
 	file_path = _state_file(guild_id)
 	if file_path.exists():
@@ -127,7 +139,7 @@ def enqueue_external_platform_progress_event(
 
 	queue.append(event)
 	with open(queue_file, "w", encoding="utf-8") as file:
-		json.dump(queue, file, indent=2, ensure_ascii=False)
+		file.write(_dumps_queue(queue))
 
 
 def pop_external_platform_progress_events(max_items: int = 100) -> list[dict[str, Any]]:
@@ -147,13 +159,13 @@ def pop_external_platform_progress_events(max_items: int = 100) -> list[dict[str
 
 		if remaining:
 			with open(queue_file, "w", encoding="utf-8") as file:
-				json.dump(remaining, file, indent=2, ensure_ascii=False)
+				file.write(_dumps_queue(remaining))
 		else:
 			try:
 				queue_file.unlink()
 			except Exception:
 				with open(queue_file, "w", encoding="utf-8") as file:
-					json.dump([], file, indent=2, ensure_ascii=False)
+					file.write(_dumps_queue([]))
 
 		return [event for event in events if isinstance(event, dict)]
 	except Exception:
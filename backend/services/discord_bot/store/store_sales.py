@@ -193,7 +193,7 @@ def _public_asset_url(asset_rel_or_abs: str | None) -> str:
 		return ""
 
 	lower = value.lower()
-	if lower.startswith("http://") or lower.startswith("https://"):
+	if lower.startswith(("http://", "https://")):
 		return value
 
 	path = value.replace("\\", "/")
@@ -3,10 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 from backend.managers.economy_manager import get_global_leaderboard
-from backend.managers.user_manager import (
-	get_discord_profile_by_user_id,
-	get_youtube_profile_by_user_id,
-)
+from backend.managers.user_lookup_manager import find_users_by_global_ids
 from backend.services.web.config.economy import create_web_economy_manager
 
 
@@ -16,13 +13,17 @@ def get_top10_payload(limit: int = 10) -> dict[str, Any]:
 	items: list[dict[str, Any]] = []
 	currency_cfg = create_web_economy_manager().get_currency()
 
+	# Perfiles de todo el top en una sola consulta (evita N+1)
+	lookups = find_users_by_global_ids(int(row.get("user_id", 0)) for row in raw_top)
+
 	for rank, row in enumerate(raw_top, start=1):
 		user_id = int(row.get("user_id", 0))
 		username = row.get("username") or f"User {user_id}"
 		balance = float(row.get("balance", 0) or 0)
 
-		discord_profile = get_discord_profile_by_user_id(user_id)
-		youtube_profile = get_youtube_profile_by_user_id(user_id)
+		lookup = lookups.get(user_id)
+		discord_profile = lookup.discord_profile if lookup else None
+		youtube_profile = lookup.youtube_profile if lookup else None
 
 		platforms: list[str] = []
 		if youtube_profile:
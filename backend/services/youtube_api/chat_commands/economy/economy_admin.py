@@ -160,7 +160,7 @@ def _resolve_lookup(query: str) -> Optional[UserLookupResult]:
 			(candidate,),
 		).fetchone()
 		if row:
-			return find_user_by_global_id(int(row["user_id"]))
+			return find_user_by_global_id(int(row["user_id"]), conn=conn)
 	finally:
 		conn.close()
 
@@ -11,6 +11,7 @@ Características:
 """
 import logging
 import hashlib
+import os
 import requests
 from pathlib import Path
 from typing import Optional, Tuple
@@ -21,6 +22,7 @@ logger = logging.getLogger(__name__)
 
 # Ruta base de almacenamiento
 AVATARS_DIR = Path(__file__).parent.parent.parent.parent / "media" / "yt_avatars"
+AVATARS_DIR_STR = os.fspath(AVATARS_DIR)
 
 
 class AvatarManager:
@@ -94,9 +96,19 @@ class AvatarManager:
             # Crear directorio si no existe
             AVATARS_DIR.mkdir(parents=True, exist_ok=True)
             
-            # Guardar archivo
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            # Guardar archivo: primero en .part y luego os.replace (atómico), para
+            # que un corte a mitad de escritura nunca deje un avatar truncado
+            tmp_path = f"{filepath}.part"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(response.content)
+                os.replace(tmp_path, filepath)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except FileNotFoundError:
+                    pass
+                raise
             
             # Ruta relativa para almacenar en BD
             relative_path = f"media/yt_avatars/{filename}"
@@ -158,9 +170,10 @@ class AvatarManager:
         Returns:
             Ruta del archivo si existe, None si no
         """
+        # Rutas como str + os.path.isfile: un stat por extensión sin crear objetos Path
+        base = os.path.join(AVATARS_DIR_STR, str(youtube_channel_id))
         for ext in AvatarManager.ALLOWED_EXTENSIONS:
-            filepath = AVATARS_DIR / f"{youtube_channel_id}{ext}"
-            if filepath.exists():
+            if os.path.isfile(base + ext):
                 return f"media/yt_avatars/{youtube_channel_id}{ext}"
         
         return None
@@ -201,22 +214,25 @@ class AvatarManager:
             Cantidad de archivos eliminados
         """
         deleted_count = 0
+        active_ids = set(active_channel_ids)
         
         try:
-            for filepath in AVATARS_DIR.glob('*'):
-                if not filepath.is_file():
-                    continue
-                
-                # Extraer channel_id del nombre (eliminar extensión)
-                channel_id = filepath.stem
-                
-                if channel_id not in active_channel_ids:
-                    try:
-                        filepath.unlink()
-                        deleted_count += 1
-                        logger.debug(f"Cleaned up avatar: {filepath.name}")
-                    except Exception as e:
-                        logger.error(f"Error deleting avatar {filepath.name}: {e}")
+            # os.scandir: nombres como str y tipo de archivo sin stat() extra por entrada
+            with os.scandir(AVATARS_DIR_STR) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    
+                    # Extraer channel_id del nombre (eliminar extensión)
+                    channel_id = os.path.splitext(entry.name)[0]
+                    
+                    if channel_id not in active_ids:
+                        try:
+                            os.unlink(entry.path)
+                            deleted_count += 1
+                            logger.debug(f"Cleaned up avatar: {entry.name}")
+                        except Exception as e:
+                            logger.error(f"Error deleting avatar {entry.name}: {e}")
             
             if deleted_count > 0:
                 logger.info(f"✅ Cleanup complete: {deleted_count} unused avatars removed")
@@ -9,6 +9,7 @@ import asyncio
 import logging
 import ssl
 import hashlib
+from collections import OrderedDict
 from typing import Optional, Callable, Dict, Any, List, Set
 from datetime import datetime, timezone
 from googleapiclient.errors import HttpError
@@ -57,11 +58,18 @@ class YouTubeListener:
         
         # Persistencia de usuarios
         self.enable_user_persistence = enable_user_persistence
+        
+        # Última URL de avatar vista por canal (LRU) para no repetir precargas
+        self._known_avatar_urls: "OrderedDict[str, str]" = OrderedDict()
+        self._known_avatar_urls_max = 4096
+        # Avatares con descarga en curso y tareas de precarga vivas (se guarda la
+        # referencia para que el GC no cancele la tarea)
+        self._prefetching_avatars: Dict[str, str] = {}
+        self._prefetch_tasks: Set[asyncio.Task] = set()
         if enable_user_persistence:
             # Inicializar avatar manager
+            # (los autores se persisten por página en _persist_users_bulk)
             AvatarManager.initialize()
-            # Registrar handler de persistencia automáticamente
-            self.add_message_handler(self._persist_user_handler)
         
         logger.info(f"YouTubeListener initialized for chat: {live_chat_id}")
         if enable_user_persistence:
@@ -75,7 +83,7 @@ class YouTubeListener:
             handler: Función que recibe un YouTubeMessage
         """
         self._message_handlers.append(handler)
-        logger.debug(f"Added message handler: {handler.__name__}")
+        logger.debug("Added message handler: %s", handler.__name__)
     
     def remove_message_handler(self, handler: Callable[[YouTubeMessage], None]) -> None:
         """
@@ -86,7 +94,7 @@ class YouTubeListener:
         """
         if handler in self._message_handlers:
             self._message_handlers.remove(handler)
-            logger.debug(f"Removed message handler: {handler.__name__}")
+            logger.debug("Removed message handler: %s", handler.__name__)
     
     async def start(self) -> None:
         """Inicia el listener en background."""
@@ -94,8 +102,9 @@ class YouTubeListener:
             logger.warning("Listener already running")
             return
 
-        if not self._message_handlers:
+        if not self._message_handlers and not self.enable_user_persistence:
             # Fallback: imprimir mensajes en consola si no hay handlers registrados
+            # (la persistencia de usuarios cuenta como procesamiento)
             self.add_message_handler(console_message_handler)
         
         self.is_running = True
@@ -115,6 +124,11 @@ class YouTubeListener:
             await self._task
             self._task = None
         
+        for task in list(self._prefetch_tasks):
+            task.cancel()
+        if self._prefetch_tasks:
+            await asyncio.gather(*self._prefetch_tasks, return_exceptions=True)
+        
         logger.info("YouTubeListener stopped")
     
     async def _listen_loop(self) -> None:
@@ -265,11 +279,22 @@ class YouTubeListener:
                             # Crear objeto mensaje
                             message = YouTubeMessage(item)
                             new_messages.append(message)
-                            logger.debug(f"New message queued: {message.author_name}: {message.message[:50]}")
+                            logger.debug("New message queued: %s: %.50s", message.author_name, message.message)
                     except Exception as e:
                         logger.error(f"Error processing individual message: {e}")
                         continue
                 
+                # Precargar los avatares de la página en segundo plano: los handlers
+                # (y los comandos) no esperan a la red de los CDNs. Es el único
+                # camino que los descarga; la persistencia solo guarda la URL
+                if self.enable_user_persistence and new_messages:
+                    self._schedule_avatar_prefetch(new_messages)
+                
+                # Persistir todos los autores de la página de una vez (fuera del loop),
+                # antes de los handlers para que los comandos ya encuentren al usuario
+                if self.enable_user_persistence and new_messages:
+                    await asyncio.to_thread(self._persist_users_bulk, new_messages)
+                
                 # Procesar nuevos mensajes
                 for message in new_messages:
                     try:
@@ -284,7 +309,7 @@ class YouTubeListener:
                 new_page_token = response.get("nextPageToken")
                 if new_page_token and new_page_token != self._next_page_token:
                     self._next_page_token = new_page_token
-                    logger.debug(f"Updated page token: {new_page_token[:20]}...")
+                    logger.debug("Updated page token: %.20s...", new_page_token)
                 
                 self.poll_interval_ms = response.get("pollingIntervalMillis", 2000)
                 
@@ -293,13 +318,78 @@ class YouTubeListener:
                     # Convertir a lista, mantener los últimos 500
                     msg_list = list(self._processed_messages)
                     self._processed_messages = set(msg_list[-500:])
-                    logger.debug(f"Cleaned up processed messages cache (kept 500 of {len(msg_list)})")
+                    logger.debug("Cleaned up processed messages cache (kept 500 of %d)", len(msg_list))
             except Exception as e:
                 logger.error(f"Error in message processing batch: {type(e).__name__}: {e}")
         
         except Exception as e:
             logger.error(f"Error in _fetch_and_process_messages: {type(e).__name__}: {e}")
     
+    def _schedule_avatar_prefetch(self, messages: List[YouTubeMessage]) -> None:
+        """Lanza _prefetch_avatars como tarea de fondo y conserva su referencia."""
+        task = asyncio.create_task(self._prefetch_avatars(messages))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._on_prefetch_done)
+    
+    def _on_prefetch_done(self, task: asyncio.Task) -> None:
+        self._prefetch_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️  Error precargando avatares: {task.exception()}")
+    
+    async def _prefetch_avatars(self, messages: List[YouTubeMessage]) -> None:
+        """
+        Descarga en paralelo los avatares de los autores de una página de mensajes.
+        
+        La respuesta de liveChatMessages ya trae profileImageUrl de cada autor,
+        así que no hace falta esperar a que cada mensaje se procese por separado.
+        
+        Args:
+            messages: Mensajes nuevos de la página actual
+        """
+        pending: Dict[str, str] = {}
+        for message in messages:
+            channel_id = message.author_channel_id
+            avatar_url = message.profile_image_url
+            if not channel_id or not avatar_url:
+                continue
+            
+            if self._known_avatar_urls.get(channel_id) == avatar_url:
+                self._known_avatar_urls.move_to_end(channel_id)
+                continue
+            
+            # Ya la está descargando una precarga anterior
+            if self._prefetching_avatars.get(channel_id) == avatar_url:
+                continue
+            
+            pending[channel_id] = avatar_url
+        
+        if not pending:
+            return
+        
+        self._prefetching_avatars.update(pending)
+        try:
+            results = await AvatarManager.download_many(
+                [(channel_id, avatar_url, "youtube") for channel_id, avatar_url in pending.items()]
+            )
+        finally:
+            for channel_id, avatar_url in pending.items():
+                if self._prefetching_avatars.get(channel_id) == avatar_url:
+                    del self._prefetching_avatars[channel_id]
+        
+        # Solo se recuerdan las descargas correctas: las fallidas se reintentan
+        # la próxima vez que el autor escriba
+        downloaded = 0
+        for (channel_id, avatar_url), result in zip(pending.items(), results):
+            if not result:
+                continue
+            self._known_avatar_urls[channel_id] = avatar_url
+            self._known_avatar_urls.move_to_end(channel_id)
+            downloaded += 1
+        while len(self._known_avatar_urls) > self._known_avatar_urls_max:
+            self._known_avatar_urls.popitem(last=False)
+        
+        logger.debug("Prefetched %d/%d avatar(s)", downloaded, len(pending))
+    
     def _fetch_messages_sync(self) -> Optional[Dict[str, Any]]:
         """
         Obtiene mensajes de la API de forma sincrónica con reintentos para errores SSL.
@@ -321,7 +411,7 @@ class YouTubeListener:
                 
                 # ✅ Validar que la respuesta sea válida
                 if response and isinstance(response, dict):
-                    logger.debug(f"✅ Fetch successful (attempt {attempt + 1}/{max_retries})")
+                    logger.debug("✅ Fetch successful (attempt %d/%d)", attempt + 1, max_retries)
                     return response
                 else:
                     logger.warning(f"⚠️  Invalid response format: {type(response)}")
@@ -399,37 +489,30 @@ class YouTubeListener:
             except Exception as e:
                 logger.exception(f"Error in message handler {handler.__name__}: {e}")
     
-    def _persist_user_handler(self, message: YouTubeMessage) -> None:
+    def _persist_users_bulk(self, messages: List[YouTubeMessage]) -> None:
         """
-        Handler interno: Persiste el usuario de YouTube en BD.
-        Se registra automáticamente si enable_user_persistence=True.
+        Persiste en BD los autores de una página de mensajes.
+        Se usa automáticamente si enable_user_persistence=True.
         
         Args:
-            message: Mensaje con información del usuario
+            messages: Mensajes nuevos de la página actual
         """
-        if not UserPackager.should_persist(message):
-            return
-        
         try:
-            # Empaquetar datos del usuario
-            packed_data = UserPackager.pack_youtube(message)
+            packed_list = [
+                UserPackager.pack_youtube(message)
+                for message in messages
+                if UserPackager.should_persist(message)
+            ]
             
-            # Persistir en BD
-            user_id, is_new = UserPackager.persist_youtube_user(packed_data, client=None)
+            # Persistir en BD (una transacción para toda la página)
+            results = UserPackager.persist_youtube_users_bulk(packed_list)
             
-            if not user_id:
-                logger.warning(f"Failed to persist user from message")
-                return
-            
-            # Log de nuevo usuario
-            if is_new:
-                logger.info(
-                    f"✨ NEW YouTube user persisted: {packed_data['youtube_username']} "
-                    f"(ID: {user_id}, Type: {packed_data['user_type']})"
-                )
+            new_count = sum(1 for _, is_new in results.values() if is_new)
+            if new_count:
+                logger.info(f"✨ {new_count} NEW YouTube user(s) persisted")
             
         except Exception as e:
-            logger.error(f"Error persisting user: {type(e).__name__}: {e}")
+            logger.error(f"Error persisting users: {type(e).__name__}: {e}")
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -505,7 +588,7 @@ async def command_processor_handler(
         command = parts[0].lower()
         args = parts[1:] if len(parts) > 1 else []
         
-        logger.debug(f"Command detected: {command} with args: {args} from {message.author_name}")
+        logger.debug("Command detected: %s with args: %s from %s", command, args, message.author_name)
 
         if not client or not live_chat_id:
             logger.warning("No client/live_chat_id provided for command processing")
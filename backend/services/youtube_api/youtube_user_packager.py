@@ -7,22 +7,19 @@ Responsabilidades:
 - Detectar nuevo usuario o actualización
 - Extraer y normalizar información (nombre, ID, tipo de usuario)
 - Crear/actualizar perfil YouTube en la BD
-- Gestionar avatares (delegado a avatar_manager)
+- Guardar la URL del avatar (la copia local la descarga la precarga del listener)
 """
 import logging
 import asyncio
-from typing import Dict, Any, Optional, Tuple
+import functools
+from typing import Dict, Any, Optional, Tuple, List
 from datetime import datetime
 
 from backend.managers.user_manager import (
     get_or_create_discord_user,
     get_user_by_id,
-    create_user,
-    create_youtube_profile,
-    get_youtube_profile_by_channel_id,
-    update_youtube_profile,
+    upsert_youtube_profiles_bulk,
 )
-from backend.managers.avatar_manager import AvatarManager
 from .youtube_types import YouTubeMessage
 
 logger = logging.getLogger(__name__)
@@ -61,151 +58,84 @@ class UserPackager:
                 'timestamp': datetime,           # Cuándo fue visto
             }
         """
+        username, user_type, is_privileged = UserPackager._pack_author(
+            message.author_name,
+            bool(message.is_owner),
+            bool(message.is_moderator),
+            bool(message.is_sponsor),
+        )
         return {
             'youtube_channel_id': message.author_channel_id,
-            'youtube_username': UserPackager._normalize_username(message.author_name),
-            'user_type': UserPackager._categorize_user(message),
+            'youtube_username': username,
+            'user_type': user_type,
             'avatar_url_remote': message.profile_image_url,  # URL que viene en el mensaje
-            'is_privileged': message.is_privileged(),
+            'is_privileged': is_privileged,
             'timestamp': datetime.fromisoformat(message.published_at) if message.published_at else datetime.now(),
             'raw_author_name': message.author_name,  # Nombre original sin normalizar
         }
     
     @staticmethod
-    def persist_youtube_user(packed_data: Dict[str, Any], client=None) -> Tuple[int, bool]:
+    @functools.lru_cache(maxsize=2048)
+    def _pack_author(
+        author_name: str,
+        is_owner: bool,
+        is_moderator: bool,
+        is_sponsor: bool,
+    ) -> Tuple[str, str, bool]:
         """
-        Persiste un usuario de YouTube a la base de datos.
-        Crea o actualiza según corresponda.
-        Automáticamente descarga avatar si viene en packed_data.
+        Parte de pack_youtube que solo depende del autor (cacheada).
+        Un mismo usuario escribe muchos mensajes por sesión con el mismo nombre y permisos.
         
-        Args:
-            packed_data: Datos empaquetados de pack_youtube()
-            client: Ignorado (parámetro legacy)
-            
         Returns:
-            Tuple: (user_id, is_new_user)
-                - user_id: ID universal del usuario
-                - is_new_user: True si fue creado, False si fue actualizado
+            Tuple: (username normalizado, user_type, is_privileged)
         """
-        channel_id = packed_data['youtube_channel_id']
-        username = packed_data['youtube_username']
-        user_type = packed_data['user_type']
-        
-        # Verificar si el perfil YouTube ya existe
-        existing_profile = get_youtube_profile_by_channel_id(channel_id)
-        
-        if existing_profile:
-            # Usuario existente: actualizar información
-            user_id = existing_profile.user_id
-
-            has_profile_changes = (
-                existing_profile.youtube_username != username
-                or existing_profile.user_type != user_type
-            )
-
-            if has_profile_changes:
-                update_youtube_profile(
-                    user_id=user_id,
-                    youtube_username=username,
-                    user_type=user_type,
-                )
-                logger.debug(
-                    f"YouTube usuario actualizado: {username} "
-                    f"(ID: {channel_id}, Tipo: {user_type})"
-                )
-
-            avatar_url_remote = packed_data.get('avatar_url_remote')
-            has_avatar_change = bool(
-                avatar_url_remote
-                and avatar_url_remote != existing_profile.channel_avatar_url
-            )
-
-            if has_avatar_change:
-                try:
-                    UserPackager._download_and_update_avatar(user_id, channel_id, avatar_url_remote)
-                except Exception as e:
-                    logger.warning(f"⚠️  Error descargando avatar para {channel_id}: {e}")
-            
-            return (user_id, False)
-        
-        else:
-            # Usuario nuevo: crear usuario universal + perfil YouTube
-            try:
-                # Crear usuario universal
-                user = create_user(username)
-                user_id = user.user_id
-                
-                # Crear perfil YouTube inicialmente sin avatar
-                profile = create_youtube_profile(
-                    user_id=user_id,
-                    youtube_channel_id=channel_id,
-                    youtube_username=username,
-                    user_type=user_type,
-                )
-                
-                logger.info(
-                    f"✨ Nuevo usuario YouTube creado: {username} "
-                    f"(ID universal: {user_id}, YouTube ID: {channel_id}, "
-                    f"Tipo: {user_type})"
-                )
-                
-                # Intentar descargar avatar después de crear
-                if packed_data.get('avatar_url_remote'):
-                    try:
-                        UserPackager._download_and_update_avatar(user_id, channel_id, packed_data['avatar_url_remote'])
-                    except Exception as e:
-                        logger.warning(f"⚠️  Error descargando avatar para {channel_id}: {e}")
-                
-                return (user_id, True)
-                
-            except Exception as e:
-                logger.error(f"❌ Error creando usuario YouTube {channel_id}: {e}")
-                return (None, False)
+        return (
+            UserPackager._normalize_username(author_name),
+            UserPackager._categorize_flags(is_owner, is_moderator, is_sponsor),
+            is_owner or is_moderator or is_sponsor,
+        )
     
     @staticmethod
-    def _download_and_update_avatar(user_id: int, channel_id: str, avatar_url: str = None) -> bool:
+    def persist_youtube_users_bulk(packed_list: List[Dict[str, Any]]) -> Dict[str, Tuple[int, bool]]:
         """
-        Descarga el avatar del usuario y actualiza la BD.
-        Usa AvatarManager centralizado para guardar en media/yt_avatars/
+        Persiste de una vez los autores de varios mensajes (una página del chat).
+        
+        Los perfiles se leen y escriben en una sola transacción
+        (ver upsert_youtube_profiles_bulk).
+        
+        No descarga avatares: solo guarda la URL remota (lo que download_avatar
+        devolvería). La copia local la baja la precarga del listener en segundo
+        plano, así quien espera a esta función (los handlers) no espera a los CDNs.
         
         Args:
-            user_id: ID universal del usuario
-            channel_id: ID del canal de YouTube
-            avatar_url: URL del avatar (viene en el mensaje del chat)
+            packed_list: Datos empaquetados de pack_youtube(), uno por mensaje
             
         Returns:
-            bool: True si se descargó exitosamente
+            dict {youtube_channel_id: (user_id, is_new_user)}
         """
-        try:
-            if not avatar_url:
-                logger.debug(f"No hay URL de avatar para {channel_id}")
-                return False
-            
-            # Descargar avatar usando AvatarManager centralizado
-            local_path = AvatarManager.download_avatar(
-                user_id=channel_id,
-                avatar_url_remote=avatar_url,
-                platform="youtube"
-            )
+        if not packed_list:
+            return {}
+        
+        # Un autor puede escribir varias veces en la misma página: vale el último mensaje
+        latest: Dict[str, Dict[str, Any]] = {}
+        for packed_data in packed_list:
+            latest[packed_data['youtube_channel_id']] = packed_data
+        
+        persisted = upsert_youtube_profiles_bulk(list(latest.values()))
+        
+        results: Dict[str, Tuple[int, bool]] = {}
+        for channel_id, (user_id, is_new, _) in persisted.items():
+            packed_data = latest[channel_id]
+            results[channel_id] = (user_id, is_new)
             
-            if local_path:
-                # Actualizar BD con ruta local
-                update_youtube_profile(
-                    user_id=user_id,
-                    channel_avatar_url=local_path,
+            if is_new:
+                logger.info(
+                    f"✨ Nuevo usuario YouTube creado: {packed_data['youtube_username']} "
+                    f"(ID universal: {user_id}, YouTube ID: {channel_id}, "
+                    f"Tipo: {packed_data['user_type']})"
                 )
-
-                logger.debug(f"Avatar descargado: {channel_id} → {local_path}")
-                return True
-            else:
-                logger.warning(f"⚠️  No se pudo descargar avatar para {channel_id}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error en descarga de avatar {channel_id}: {e}")
-            return False
-    
-
+        
+        return results
     
     @staticmethod
     def _normalize_username(username: str) -> str:
@@ -248,11 +178,16 @@ class UserPackager:
         Returns:
             String: 'owner', 'moderator', 'member' o 'regular'
         """
-        if message.is_owner:
+        return UserPackager._categorize_flags(message.is_owner, message.is_moderator, message.is_sponsor)
+    
+    @staticmethod
+    def _categorize_flags(is_owner: bool, is_moderator: bool, is_sponsor: bool) -> str:
+        """Jerarquía de _categorize_user a partir de los flags sueltos."""
+        if is_owner:
             return "owner"
-        elif message.is_moderator:
+        elif is_moderator:
             return "moderator"
-        elif message.is_sponsor:
+        elif is_sponsor:
             return "member"
         else:
             return "regular"
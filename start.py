@@ -7,15 +7,15 @@ Ejecuta desde raíz: python start.py
 ✓ Si no hay venv, usa el Python global del sistema
 """
 
+import os
 import subprocess
 import sys
-from pathlib import Path
 
 # Obtener la raíz del proyecto
-PROJECT_ROOT = Path(__file__).parent
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 
 # Configurar el path para importar correctamente
-sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, PROJECT_ROOT)
 
 def main():
     """Inicia PowerBot"""
@@ -37,7 +37,21 @@ def main():
         # 2. Importar y ejecutar app.py
         from backend.app import main as app_main
         
-        exit_code = asyncio.run(app_main())
+        # uvloop es opcional: si está instalado (no existe en Windows) se usa su loop
+        run = asyncio.run
+        if sys.platform != "win32":
+            try:
+                import uvloop
+            except ImportError:
+                uvloop = None
+            if uvloop is not None:
+                if hasattr(uvloop, "run"):
+                    run = uvloop.run
+                else:
+                    # uvloop < 0.18 no tiene run(): instalar su policy y usar asyncio.run
+                    uvloop.install()
+        
+        exit_code = run(app_main())
         sys.exit(exit_code if isinstance(exit_code, int) else 1)
         
     except KeyboardInterrupt:
@@ -0,0 +1,100 @@
+"""
+Tests de UserPackager.pack_youtube: normalización del autor, mapeo de
+user_type y memoización de _pack_author.
+"""
+import pytest
+
+from backend.services.youtube_api.youtube_types import YouTubeMessage
+from backend.services.youtube_api.youtube_user_packager import UserPackager
+
+
+class MockYouTubeMessage(YouTubeMessage):
+    """YouTubeMessage construido a partir de los campos que usa pack_youtube."""
+
+    def __init__(
+        self,
+        channel_id: str,
+        author_name: str,
+        is_mod: bool = False,
+        is_owner: bool = False,
+        is_sponsor: bool = False,
+    ):
+        super().__init__({
+            "id": f"msg-{channel_id}",
+            "snippet": {
+                "publishedAt": "2024-01-01T12:00:00+00:00",
+                "textMessageDetails": {"messageText": "hola"},
+            },
+            "authorDetails": {
+                "channelId": channel_id,
+                "displayName": author_name,
+                "isChatModerator": is_mod,
+                "isChatOwner": is_owner,
+                "isChatSponsor": is_sponsor,
+                "profileImageUrl": f"https://yt3.ggpht.com/{channel_id}=s88-c-k",
+            },
+        })
+
+
+@pytest.fixture(scope="module")
+def packed_mock():
+    """Mensaje empaquetado una sola vez y compartido por los tests del módulo."""
+    return UserPackager.pack_youtube(MockYouTubeMessage("UCtest001", "TestUser001", is_mod=True))
+
+
+def test_pack_youtube_ids(packed_mock):
+    assert packed_mock["youtube_channel_id"] == "UCtest001"
+    assert packed_mock["avatar_url_remote"] == "https://yt3.ggpht.com/UCtest001=s88-c-k"
+
+
+def test_pack_youtube_normalizes_username(packed_mock):
+    assert packed_mock["youtube_username"] == "testuser001"
+    assert packed_mock["raw_author_name"] == "TestUser001"
+
+
+def test_pack_youtube_moderator_flags(packed_mock):
+    assert packed_mock["user_type"] == "moderator"
+    assert packed_mock["is_privileged"] is True
+
+
+def test_pack_youtube_timestamp(packed_mock):
+    assert packed_mock["timestamp"].year == 2024
+
+
+@pytest.mark.parametrize(
+    "flags, expected_type, expected_privileged",
+    [
+        ({"is_owner": True, "is_mod": True, "is_sponsor": True}, "owner", True),
+        ({"is_mod": True, "is_sponsor": True}, "moderator", True),
+        ({"is_sponsor": True}, "member", True),
+        ({}, "regular", False),
+    ],
+)
+def test_user_type_mapping(flags, expected_type, expected_privileged):
+    packed = UserPackager.pack_youtube(MockYouTubeMessage("UCtype001", "Tipo", **flags))
+    assert packed["user_type"] == expected_type
+    assert packed["user_type"] in UserPackager.USER_TYPES
+    assert packed["is_privileged"] is expected_privileged
+
+
+def test_pack_author_is_memoized():
+    UserPackager._pack_author.cache_clear()
+
+    first = UserPackager.pack_youtube(MockYouTubeMessage("UCmemo001", "Memo User", is_sponsor=True))
+    second = UserPackager.pack_youtube(MockYouTubeMessage("UCmemo001", "Memo User", is_sponsor=True))
+
+    info = UserPackager._pack_author.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+    assert first["youtube_username"] == second["youtube_username"] == "memouser"
+
+
+def test_pack_author_cache_keys_on_flags():
+    UserPackager._pack_author.cache_clear()
+
+    regular = UserPackager.pack_youtube(MockYouTubeMessage("UCmemo002", "Same Name"))
+    moderator = UserPackager.pack_youtube(MockYouTubeMessage("UCmemo002", "Same Name", is_mod=True))
+
+    assert UserPackager._pack_author.cache_info().misses == 2
+    assert regular["user_type"] == "regular"
+    assert moderator["user_type"] == "moderator"